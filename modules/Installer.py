@@ -0,0 +1,302 @@
+""" Installer Module | by ANXETY """
+
+from modules.archive_utils import install_zip                   # Streamed WebUI zip
+from modules.git_utils import clone_repo, clone_repos, run_git   # Mirrored clones
+from modules.Manager import download_url_to_path                 # Fallback downloader
+from modules.config_utils import local_config                    # Verified local __configs__
+from modules.trace_utils import span                             # Install tracing
+import modules.json_utils as js                                  # JSON
+
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, Union
+from requests.adapters import HTTPAdapter
+from pathlib import Path
+import threading
+import requests
+import asyncio
+import shutil
+import time
+import sys
+import os
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+osENV = os.environ
+
+PATHS = {k: Path(v) for k, v in osENV.items() if k.endswith('_path')}
+HOME = PATHS.get('home_path', Path.cwd())
+VENV = PATHS.get('venv_path', Path.cwd() / 'anxlight_venv')
+SETTINGS_PATH = PATHS.get('settings_path', Path.cwd() / 'config/settings.json')
+
+HF_ARCHIVE = 'https://huggingface.co/NagisaNao/ANXETY/resolve/main/{ui}.zip'
+
+
+# ======================= MANIFESTS ========================
+
+@dataclass(slots=True)
+class Step:
+    """
+    One node of the install DAG
+
+    Sync funcs run in a worker thread; is_async funcs are awaited on the loop.
+    is_async is detected for `async def` funcs, wrappers (lambdas) must set it.
+    """
+    name: str
+    func: Callable[['Installer'], Union[Any, Awaitable[Any]]]
+    deps: tuple[str, ...] = ()
+    required: bool = False      # Failure aborts the install
+    is_async: bool = False
+
+    def __post_init__(self):
+        self.is_async = self.is_async or asyncio.iscoroutinefunction(self.func)
+
+
+@dataclass(slots=True)
+class UIManifest:
+    """
+    Declarative description of a WebUI install
+
+    configs are (source under __configs__, target dir[, filename]) where the
+    target may use {webui}/{venv}/{home}. extensions are 'url [name]' specs
+    cloned into extensions_dir; kaggle_extensions are added on Kaggle.
+    post steps run after the steps they depend on ('webui', 'configs',
+    'extensions', a single 'config:<source>' step or another post step).
+    'extensions' only fails if every clone failed.
+    """
+    name: str
+    archive: Optional[str] = None           # Zip URL ({ui} is replaced)
+    git: Optional[str] = None               # Repo URL, full clone
+    git_branch: Optional[str] = None
+    configs: list[tuple[str, ...]] = field(default_factory=list)
+    extensions: list[str] = field(default_factory=list)
+    kaggle_extensions: list[str] = field(default_factory=list)
+    extensions_dir: str = 'extensions'
+    post: list[Step] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class StepResult:
+    name: str
+    ok: bool = False
+    skipped: bool = False
+    elapsed: float = 0.0
+    error: str = ''
+
+
+# ========================= ENGINE =========================
+
+def _read_setting(key: str, default: str) -> str:
+    return (js.read(SETTINGS_PATH, key) if SETTINGS_PATH.exists() else None) or default
+
+def http_client():
+    """
+    Keep-alive client shared by all config downloads
+
+    httpx with HTTP/2 (one multiplexed connection per host) when httpx and
+    h2 are installed, otherwise a pooled requests.Session. Both are safe to
+    use from the installer's worker threads.
+    """
+    if httpx is not None:
+        try:
+            return httpx.Client(http2=True, follow_redirects=True, timeout=30)
+        except ImportError:     # h2 missing
+            return httpx.Client(follow_redirects=True, timeout=30)
+
+    session = requests.Session()
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=2))
+    return session
+
+
+class Installer:
+    """Turns a UIManifest into a dependency DAG and runs it with every independent step in parallel"""
+
+    def __init__(self, manifest: UIManifest, home: Path = HOME, venv: Path = VENV):
+        self.manifest = manifest
+        self.ui = manifest.name
+        self.home = Path(home)
+        self.venv = Path(venv)
+        self.webui = self.home / self.ui
+        self.env_name = _read_setting('ENVIRONMENT.env_name', 'Colab')
+        self.fork_repo = _read_setting('ENVIRONMENT.fork', 'anxety-solo/sd-webui')
+        self.branch = _read_setting('ENVIRONMENT.branch', 'main')
+        self.config_url = f"https://raw.githubusercontent.com/{self.fork_repo}/{self.branch}/__configs__"
+        self.results: dict[str, StepResult] = {}
+        self._client = None
+        self._client_lock = threading.Lock()
+
+    def log(self, message: str, error: bool = False) -> None:
+        print(f"--- [{self.ui}.py] {message} ---", file=sys.stderr if error else sys.stdout)
+
+    def resolve(self, template: str) -> Path:
+        return Path(template.format(webui=self.webui, venv=self.venv, home=self.home))
+
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                self._client = http_client()
+            return self._client
+
+    # --- Steps ---
+
+    def install_archive(self) -> None:
+        url = self.manifest.archive.format(ui=self.ui)
+        self.log(f"Streaming WebUI from {url} into {self.webui}")
+        installed = install_zip(
+            url, self.webui, zip_path=self.home / f"{self.ui}.zip",
+            download=lambda u, path: download_url_to_path(url=u, target_full_path=path, log=True),
+            log=True
+        )
+        if not installed:
+            raise RuntimeError(f"Failed to install {url}")
+
+    async def install_git(self) -> None:
+        if self.webui.exists():
+            self.log(f"Directory {self.webui} already exists. Assuming {self.ui} is already cloned. Attempting to update...")
+            code, stderr = await run_git('pull', cwd=self.webui)
+            if code != 0:
+                self.log(f"WARNING: 'git pull' failed for existing {self.ui} clone: {stderr}", error=True)
+            return
+        self.log(f"Cloning WebUI from {self.manifest.git} into {self.webui}")
+        result = await clone_repo(self.manifest.git, self.webui, depth=None)
+        if not result.ok:
+            raise RuntimeError(result.error)
+        if self.manifest.git_branch:
+            code, stderr = await run_git('checkout', self.manifest.git_branch, cwd=self.webui)
+            if code != 0:
+                raise RuntimeError(stderr)
+
+    def fetch_config(self, source: str, target_dir: str, filename: Optional[str] = None) -> None:
+        """
+        Copy a config file from the local __configs__ tree, or download it with the shared client
+
+        The local copy is used only if it matches __configs__/manifest.json and
+        the manifest records the configured fork and branch (see config_utils.local_config).
+        """
+        source = source.format(ui=self.ui)
+        directory = self.resolve(target_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / (filename or Path(source).name)
+
+        local = local_config(source, self.fork_repo, self.branch)
+        if local is not None:
+            shutil.copyfile(local, target)
+            return
+
+        response = self.client.get(f"{self.config_url}/{source}", timeout=30)
+        response.raise_for_status()
+        target.write_bytes(response.content)
+
+    async def clone_extensions(self) -> None:
+        extensions = list(self.manifest.extensions)
+        if self.env_name == 'Kaggle':
+            extensions += self.manifest.kaggle_extensions
+        target = self.webui / self.manifest.extensions_dir
+        self.log(f"Cloning extensions into {target}")
+        results = await clone_repos(extensions, target, tag=f"{self.ui}.py")
+        failed = [r.name for r in results if not r.ok]
+        if failed and len(failed) == len(results):
+            raise RuntimeError(f"Failed to clone: {', '.join(failed)}")
+        if failed:     # Partial failure: the WebUI still works, dependent steps should run
+            self.log(f"WARNING: failed to clone {len(failed)}/{len(results)} extensions: {', '.join(failed)}", error=True)
+
+    def build_steps(self) -> dict[str, Step]:
+        """Manifest -> DAG. Configs inside the WebUI wait for it (the archive may ship the same files)"""
+        m = self.manifest
+        if m.archive:
+            steps = [Step('webui', lambda i: i.install_archive(), required=True)]
+        else:
+            steps = [Step('webui', lambda i: i.install_git(), required=True, is_async=True)]
+
+        config_steps = []
+        for config in m.configs:
+            name = f"config:{config[0]}"
+            inside = '{webui}' in config[1]
+            steps.append(Step(name, lambda i, c=config: i.fetch_config(*c), deps=('webui',) if inside else ()))
+            config_steps.append(name)
+        steps.append(Step('configs', lambda i: None, deps=tuple(config_steps)))
+
+        if m.extensions:
+            steps.append(Step('extensions', lambda i: i.clone_extensions(), deps=('webui',), is_async=True))
+        else:
+            steps.append(Step('extensions', lambda i: None))
+
+        steps.extend(m.post)
+        return {step.name: step for step in steps}
+
+    # --- Execution ---
+
+    @staticmethod
+    def check_dag(steps: dict[str, Step]) -> None:
+        """Raise on unknown dependencies or cycles"""
+        state = {}
+        def visit(name, chain):
+            if state.get(name) == 'done':
+                return
+            if name in chain:
+                raise ValueError(f"Dependency cycle: {' -> '.join(chain + [name])}")
+            if name not in steps:
+                raise ValueError(f"Unknown step '{name}' (required by {chain[-1]})")
+            for dep in steps[name].deps:
+                visit(dep, chain + [name])
+            state[name] = 'done'
+        for name in steps:
+            visit(name, [])
+
+    async def _run_step(self, step: Step, tasks: dict[str, asyncio.Task]) -> StepResult:
+        result = StepResult(step.name)
+        deps = [await tasks[dep] for dep in step.deps]
+        if not all(dep.ok for dep in deps):
+            result.skipped = True
+            result.error = f"dependency failed: {', '.join(d.name for d in deps if not d.ok)}"
+            return result
+
+        start = time.perf_counter()
+        try:
+            with span(step.name, cat='installer', ui=self.ui):
+                if step.is_async:
+                    await step.func(self)
+                else:   # Blocking work (downloads, unzip) -> worker thread
+                    await asyncio.to_thread(step.func, self)
+            result.ok = True
+        except Exception as e:
+            result.error = str(e)
+            self.log(f"ERROR in step '{step.name}': {e}", error=True)
+        result.elapsed = time.perf_counter() - start
+        return result
+
+    async def run(self) -> bool:
+        """Run the DAG; returns False if a required step failed"""
+        steps = self.build_steps()
+        self.check_dag(steps)
+
+        start = time.perf_counter()
+        tasks = {}
+        with span(f"install {self.ui}", cat='installer'):
+            for name, step in steps.items():
+                tasks[name] = asyncio.ensure_future(self._run_step(step, tasks))
+            try:
+                results = await asyncio.gather(*tasks.values())
+            finally:
+                if self._client is not None:
+                    self._client.close()
+                    self._client = None
+        self.results = {r.name: r for r in results}
+
+        for r in results:
+            if r.skipped:
+                self.log(f"Skipped '{r.name}' ({r.error})", error=True)
+        self.log(f"Install finished in {time.perf_counter() - start:.1f}s")
+        return all(r.ok for r in results if steps[r.name].required)
+
+
+def run_installer(manifest: UIManifest) -> None:
+    """Entry point for UIs/*.py manifests"""
+    print(f"--- AnxLight {manifest.name} UI Installer Script ---")
+    if not asyncio.run(Installer(manifest).run()):
+        sys.exit(1)
+    print(f"--- [{manifest.name}.py] Script finished ---")
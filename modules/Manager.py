@@ -2,12 +2,12 @@
 
 from modules.CivitaiAPI import CivitAiAPI    # CivitAI API
 import modules.json_utils as js              # JSON
+from modules.archive_utils import extract_zip   # Parallel unzip
 
 from urllib.parse import urlparse, parse_qs
 from pathlib import Path
 import subprocess
 import requests
-import zipfile
 import shlex
 import sys
 import os
@@ -263,8 +263,7 @@ def unzip_file(zip_filepath_str, log):
     zip_filepath = Path(zip_filepath_str)
     extract_path = zip_filepath.parent
     log_message(f">> Unzipping: {zip_filepath} to {extract_path}", log)
-    with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
-        zip_ref.extractall(extract_path)
+    extract_zip(zip_filepath, extract_path, log=log)
     log_message(f">> Successfully unpacked: {zip_filepath}", log)
     return True
 
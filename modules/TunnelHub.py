@@ -8,21 +8,40 @@ Use the original script of the author cupang-afk.
 """
 
 
-from typing import Callable, List, Optional, Tuple, TypedDict, Union, get_args
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, TypedDict, Union, get_args
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from threading import Event, Lock, Thread
+from collections import OrderedDict, deque
+from queue import Queue
 from pathlib import Path
 import subprocess
+import statistics
+import hashlib
+import json
+import requests
 import logging
+import asyncio
+import atexit
+import gzip
 import socket
+import signal
+import shutil
 import shlex
 import time
 import re
 import os
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
 
 StrOrPath = Union[str, Path]
 StrOrRegexPattern = Union[str, re.Pattern]
 ListHandlersOrBool = Union[List[logging.Handler], bool]
+ProcessLike = Union[subprocess.Popen, asyncio.subprocess.Process]
 
 
 class ColoredFormatter(logging.Formatter):
@@ -51,12 +70,166 @@ class FileFormatter(logging.Formatter):
         return self.strip_ansi_codes(formatted_message)
 
 
+class BufferedFileHandler(MemoryHandler):
+    """
+    File handler that batches records: writes when the buffer fills, on errors, or when a record arrives
+    `interval` seconds after the last write. Quiet periods are covered by the LogPipeline flusher thread.
+    """
+
+    def __init__(self, filename: StrOrPath, formatter: logging.Formatter, capacity: int = 512, interval: float = 2.0):
+        target = logging.FileHandler(filename, encoding='utf-8')
+        target.setFormatter(formatter)
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self.interval = interval
+        self.last_flush = time.monotonic()
+
+    def shouldFlush(self, record: logging.LogRecord) -> bool:
+        return super().shouldFlush(record) or time.monotonic() - self.last_flush >= self.interval
+
+    def flush(self) -> None:
+        super().flush()
+        self.last_flush = time.monotonic()
+
+    def close(self) -> None:
+        target = self.target
+        super().close()  # Flushes and drops the target
+        if target:
+            target.close()
+
+
+class TunnelLogRouter(logging.Handler):
+    """Routes records of each `TunnelHub.<name>` child logger to that tunnel's buffered log file."""
+
+    def __init__(self, prefix: str):
+        super().__init__(logging.DEBUG)
+        self.prefix = prefix + '.'
+        self.handlers: dict = {}
+
+    def add(self, name: str, path: Path) -> None:
+        self.remove(name)
+        self.handlers[self.prefix + name] = BufferedFileHandler(path, FileFormatter("[%(name)s]: %(message)s"))
+
+    def remove(self, name: str) -> None:
+        handler = self.handlers.pop(self.prefix + name, None)
+        if handler:
+            handler.close()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self.handlers.get(record.name)
+        if handler:
+            handler.handle(record)
+
+    def flush(self) -> None:
+        for handler in list(self.handlers.values()):
+            handler.flush()
+
+    def close(self) -> None:
+        for handler in list(self.handlers.values()):
+            handler.close()
+        self.handlers.clear()
+        super().close()
+
+
+class LogPipeline:
+    """
+    Process-wide log queue shared by all Tunnel instances: one QueueListener thread, one flusher thread
+    writing buffered files every `interval` seconds (so the last lines of a quiet or crashed tunnel reach
+    disk), and a single atexit hook.
+    """
+
+    def __init__(self, interval: float = 2.0):
+        self.queue: Queue = Queue()
+        self.interval = interval
+        self.handlers: Tuple[logging.Handler, ...] = ()   # Current output handlers (of the latest Tunnel)
+        self.owned: List[logging.Handler] = []            # Buffered handlers to close at exit
+        self.lock = Lock()
+        self.listener: Optional[QueueListener] = None
+        self.stopped = Event()
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """QueueListener target: dispatch to the current handlers, respecting their levels."""
+        for handler in self.handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def attach(self, handlers: List[logging.Handler], owned: List[logging.Handler]) -> None:
+        """Route records to handlers from now on; start the listener on first use."""
+        with self.lock:
+            self.handlers = tuple(handlers)
+            self.owned.extend(owned)
+            if self.listener is None:
+                self.listener = QueueListener(self.queue, self)
+                self.listener.start()
+                Thread(target=self._flush_loop, name='TunnelHub-log-flush', daemon=True).start()
+                atexit.register(self.close)
+
+    def detach(self, handlers: List[logging.Handler]) -> None:
+        """Wait until queued records are written, then stop routing to (and owning) handlers."""
+        if self.listener is not None:
+            self.queue.join()
+        with self.lock:
+            self.handlers = tuple(h for h in self.handlers if h not in handlers)
+            self.owned = [h for h in self.owned if h not in handlers]
+
+    def flush(self) -> None:
+        for handler in list(self.owned):
+            handler.flush()
+
+    def _flush_loop(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Drain the queue and close the buffered files (registered with atexit)."""
+        with self.lock:
+            if self.listener is None:
+                return
+            self.stopped.set()
+            self.listener.stop()
+            self.listener = None
+            for handler in self.owned:
+                handler.close()
+            self.owned.clear()
+
+
+LOG_PIPELINE = LogPipeline()
+
+
+class PipeDrain(Thread):
+    """
+    Keep reading a handed off process's stdout from the moment its URL was found until it is adopted,
+    so a chatty provider never blocks on a full pipe. Lines are buffered and read back via readline().
+    """
+
+    def __init__(self, stream):
+        super().__init__(name='TunnelHub-drain', daemon=True)
+        self.stream = stream
+        self.lines: Queue = Queue()
+        self.start()
+
+    def run(self) -> None:
+        try:
+            for line in iter(self.stream.readline, ''):
+                self.lines.put(line)
+        except (OSError, ValueError):
+            pass  # Pipe closed under us
+        finally:
+            self.lines.put('')  # EOF
+
+    def readline(self) -> str:
+        return self.lines.get()
+
+
 class TunnelDict(TypedDict):
     command: str
     pattern: re.Pattern
     name: str
     note: Optional[str]
     callback: Optional[Callable[[str, Optional[str], Optional[str]], None]]
+    process: Optional[subprocess.Popen]
+    url: Optional[str]
+    output: Optional[List[str]]
+    drain: Optional[PipeDrain]
 
 
 class Tunnel:
@@ -64,9 +237,12 @@ class Tunnel:
     A class for creating and managing tunnels.
 
     This class allows for the establishment of tunnels to redirect traffic through specified ports.
-    It supports local port checking, process and thread management, as well as logging for debugging
+    It supports local port checking, process management, as well as logging for debugging
     and monitoring tunnel operations.
 
+    All tunnels run as asyncio tasks on a private event loop, driven by a single background thread,
+    so subprocess output is read concurrently and waiters are woken by events instead of polling.
+
     Attributes:
         port (int): The port on which the tunnel will be created.
         check_local_port (bool): Flag indicating whether to check the local port before creating the tunnel.
@@ -77,19 +253,34 @@ class Tunnel:
         log_dir (StrOrPath): Directory for storing logs. If not specified, the current working directory is used.
         callback (Callable[[List[Tuple[str, Optional[str]]]], None]): A callback function that will be invoked with
             a list of URLs after the tunnel is created.
+        reconnect (bool): Restart tunnel processes (with exponential backoff) when they exit unexpectedly.
+        health_interval (float): Seconds between public URL probes; a URL failing 3 probes in a row gets its
+            tunnel restarted. None or 0 disables probing.
+        timeline (Timeline): Shared phase timeline (e.g. from launch.py probes); a new one is created if not given.
+        proxy_port (int): If set, a ReverseProxy listening on this port and forwarding to `port` runs while the
+            tunnel is up; tunnel commands should then point at `proxy_port` (readiness still waits for `port`).
+        resolve_binary (Callable[[str], Optional[str]]): Returns the path of a command or None if it is not
+            installed (e.g. launch.py's cached ProviderRegistry.binary); defaults to shutil.which.
+        port_timeout (float): Seconds to wait for the local port to start listening before giving up; spawned
+            tunnels are then not started and the printer reports the failure. None waits indefinitely.
 
     Instance Attributes:
         _is_running (bool): Indicates whether the tunnel is currently running.
         urls (List[Tuple[str, Optional[str], Optional[str]]]): List of URLs associated with the tunnel,
             including the URL, note, and name of the tunnel.
         urls_lock (Lock): Mutex for safe access to the list of URLs, ensuring thread-safety.
-        jobs (List[Thread]): List of threads associated with the tunnel, used for managing tunnel processes.
-        processes (List[subprocess.Popen]): List of running subprocesses for managing tunnels.
+        jobs (List[asyncio.Task]): List of event loop tasks associated with the tunnel (printer, port watcher, tunnels).
+        processes (List[ProcessLike]): List of running subprocesses (spawned or adopted) for managing tunnels.
+        tunnel_processes (Dict[str, ProcessLike]): Current process of each tunnel by name, used by the health monitor.
+        output_tails (Dict[str, deque]): Ring buffer of the last output lines of each tunnel, dumped to the log
+            when a tunnel process exits unexpectedly.
         tunnel_list (List[TunnelDict]): List of dictionaries containing parameters for each tunnel added.
         stop_event (Event): Event used to signal the stopping of tunnel operations.
+        port_failed (bool): Set when the local port did not start listening within `port_timeout`.
         printed (Event): Event indicating whether tunnel information has been printed to the console.
         logger (logging.Logger): Logger for recording information about the tunnel's operation, including
-            errors and status updates.
+            errors and status updates. It only enqueues records; the process-wide LOG_PIPELINE thread does
+            the console output and buffered file writes.
 
     Exceptions:
         ValueError: Raised if the specified port is invalid or occupied.
@@ -106,13 +297,21 @@ class Tunnel:
         log_handlers: ListHandlersOrBool = None,
         log_dir: StrOrPath = None,
         callback: Callable[[List[Tuple[str, Optional[str]]]], None] = None,
+        reconnect: bool = True,
+        health_interval: Optional[float] = 60,
+        proxy_port: Optional[int] = None,
+        timeline: Optional['Timeline'] = None,
+        port_timeout: Optional[float] = 900,
+        resolve_binary: Optional[Callable[[str], Optional[str]]] = None,
     ):
         """Initialize the Tunnel class with provided parameters."""
         self._is_running = False
         self.urls: List[Tuple[str, Optional[str], Optional[str]]] = []
         self.urls_lock = Lock()
-        self.jobs: List[Thread] = []
-        self.processes: List[subprocess.Popen] = []
+        self.jobs: List[asyncio.Task] = []
+        self.processes: List[ProcessLike] = []
+        self.tunnel_processes: Dict[str, ProcessLike] = {}
+        self.output_tails: Dict[str, deque] = {}
         self.tunnel_list: List[TunnelDict] = []
         self.stop_event: Event = Event()
         self.printed = Event()
@@ -123,12 +322,33 @@ class Tunnel:
         self.log_handlers = log_handlers or []
         self.log_dir = Path(log_dir) if log_dir else Path.home() / 'tunnel_logs'
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.timeline_path = self.log_dir / 'tunnel_timeline.json'
         self.callback = callback
+        self.reconnect = reconnect
+        self.health_interval = health_interval
+        self.proxy_port = proxy_port
+        self.proxy: Optional[ReverseProxy] = None
+        self.timeline = timeline or Timeline()
+        self.port_timeout = port_timeout
+        self.port_failed = False
+        self.resolve_binary = resolve_binary or shutil.which
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[Thread] = None
+        self._port_ready: Optional[asyncio.Event] = None
+        self._urls_ready: Optional[asyncio.Event] = None
+        self._url_matcher: Union[re.Pattern, bool, None] = None
 
         self.logger = self.setup_logger(propagate)
 
     def setup_logger(self, propagate: bool) -> logging.Logger:
-        """Set up the logger for the tunnel operations."""
+        """
+        Set up the logger for the tunnel operations.
+
+        The logger itself only has a QueueHandler, so logging from the output readers never blocks;
+        console output, tunnelhub.log and the per-tunnel logs are written by the shared LOG_PIPELINE
+        listener thread through buffered file handlers.
+        """
         logger = logging.getLogger('TunnelHub')
         logger.setLevel(logging.DEBUG if self.debug else logging.INFO)
         logger.propagate = propagate
@@ -137,33 +357,50 @@ class Tunnel:
             for handler in logger.handlers[:]:
                 logger.removeHandler(handler)
 
-        if not any(isinstance(h, logging.StreamHandler) for h in logger.handlers):
-            stream_handler = logging.StreamHandler()
-            stream_handler.setLevel(logger.level)
-            stream_handler.setFormatter(ColoredFormatter('{message}', style='{'))
-            logger.addHandler(stream_handler)
+        stream_handler = logging.StreamHandler()
+        stream_handler.setLevel(logger.level)
+        stream_handler.setFormatter(ColoredFormatter('{message}', style='{'))
 
         log_file = self.log_dir / 'tunnelhub.log'
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(FileFormatter("[%(asctime)s] [%(name)s]: %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
-        logger.addHandler(file_handler)
+        self.log_file_handler = BufferedFileHandler(
+            log_file, FileFormatter("[%(asctime)s] [%(name)s]: %(message)s", datefmt="%Y-%m-%d %H:%M:%S")
+        )
+        self.log_router = TunnelLogRouter(logger.name)
 
-        for handler in self.log_handlers:
-            logger.addHandler(handler)
+        self.log_outputs = [stream_handler, self.log_file_handler, self.log_router, *self.log_handlers]
+        if not any(isinstance(h, QueueHandler) and h.queue is LOG_PIPELINE.queue for h in logger.handlers):
+            logger.addHandler(QueueHandler(LOG_PIPELINE.queue))
+        LOG_PIPELINE.attach(self.log_outputs, owned=[self.log_file_handler, self.log_router])
 
         return logger
 
+    def flush_logs(self) -> None:
+        """Write out buffered log records."""
+        self.log_file_handler.flush()
+        self.log_router.flush()
+
+    def close_logging(self) -> None:
+        """Write out queued records and close this instance's log files (LOG_PIPELINE does it at exit)."""
+        LOG_PIPELINE.detach(self.log_outputs)
+        self.log_router.close()
+        self.log_file_handler.close()
+
     def is_command_available(self, command: str) -> bool:
-        """Check if the specified command is available in the system PATH."""
-        return any(
-            os.access(os.path.join(path, command), os.X_OK)
-            for path in os.environ['PATH'].split(os.pathsep)
-        )
+        """Check if the specified command is available, through `resolve_binary` (cached by the caller)."""
+        return self.resolve_binary(command) is not None
 
     def add_tunnel(self, *, command: str, pattern: StrOrRegexPattern, name: str,
-                 note: str = None, callback: Callable[[str, Optional[str], Optional[str]], None] = None) -> None:
-        """Add a new tunnel with the specified command, pattern, name, and optional note and callback."""
+                 note: str = None, callback: Callable[[str, Optional[str], Optional[str]], None] = None,
+                 process: subprocess.Popen = None, url: str = None, output: List[str] = None,
+                 drain: PipeDrain = None) -> None:
+        """
+        Add a new tunnel with the specified command, pattern, name, and optional note and callback.
+
+        An already connected process (e.g. from a probe) can be handed off with `process`, its
+        extracted `url` and the `output` lines read so far; it is adopted instead of starting
+        `command` again. `command` is still used if the process has died. If the process's stdout
+        is already being read by a `drain`, its buffered and further lines are read from it.
+        """
         cmd_name = command.split()[0]
         if not self.is_command_available(cmd_name):
             self.logger.warning(f"Skipping {name} - {cmd_name} not installed")
@@ -173,24 +410,28 @@ class Tunnel:
             pattern = re.compile(pattern)
 
         self.logger.debug(f"Adding tunnel {command=} {pattern=} {name=} {note=} {callback=}")
+        self._url_matcher = None  # Rebuilt with the new pattern on next use
         self.tunnel_list.append({
             'command': command,
             'pattern': pattern,
             'name': name,
             'note': note,
             'callback': callback,
+            'process': process,
+            'url': url,
+            'output': output,
+            'drain': drain,
         })
 
     def start(self) -> None:
-        """Start the tunnel and its associated threads."""
+        """Start the tunnel and block until the URLs have been printed."""
         if self._is_running:
             raise RuntimeError('Tunnel is already running')
 
         self.__enter__()
 
         try:
-            while not self.printed.is_set():
-                time.sleep(1)
+            self.printed.wait()
         except KeyboardInterrupt:
             self.logger.warning('\\033[33m⚠️  Keyboard Interrupt detected, stopping tunnel\\033[0m')
             self.stop()
@@ -202,56 +443,122 @@ class Tunnel:
 
         self.logger.info(f"💣 \\033[32mTunnels:\\033[0m \\033[34m{self.get_tunnel_names()}\\033[0m -> \\033[31mKilled.\\033[0m")
         self.stop_event.set()
-        self.terminate_processes()
-        self.join_threads()
+        self.run_in_loop(self._shutdown())
+        self.timeline.mark('TunnelHub', 'stop')
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        try:
+            self.timeline.dump(self.timeline_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write timeline: {e}")
+        self.flush_logs()
         self.reset()
 
     def get_tunnel_names(self) -> str:
         """Get a comma-separated string of tunnel names."""
         return ', '.join(tunnel['name'] for tunnel in self.tunnel_list)
 
-    def terminate_processes(self) -> None:
+    def run_in_loop(self, coro: Awaitable):
+        """Run a coroutine on the tunnel event loop from another thread and return its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _shutdown(self) -> None:
+        """Terminate processes first (so readers hit EOF), then cancel the remaining tasks."""
+        await self.terminate_processes()
+        for job in self.jobs:
+            job.cancel()
+        await asyncio.gather(*self.jobs, return_exceptions=True)
+        if self.proxy:
+            await self.proxy.stop()
+            self.proxy = None
+        await self._loop.shutdown_default_executor()
+
+    async def terminate_processes(self) -> None:
         """Terminate all running subprocesses associated with the tunnels."""
-        for process in self.processes:
-            try:
-                if process.poll() is None:
-                    process.terminate()
-                    process.wait(timeout=5)
-            except Exception as e:
-                self.logger.warning(f"Error terminating process: {str(e)}")
+        await asyncio.gather(*(self.terminate_process(p) for p in self.processes))
         self.processes.clear()
 
-    def join_threads(self) -> None:
-        """Wait for all threads associated with the tunnels to finish."""
-        for job in self.jobs:
-            job.join()
+    async def terminate_process(self, process: ProcessLike) -> None:
+        """Terminate a single subprocess, killing it if it does not exit in time."""
+        try:
+            if self.is_process_alive(process):
+                self.signal_process(process, signal.SIGTERM)
+                try:
+                    await self.wait_process(process, timeout=5)
+                except (asyncio.TimeoutError, subprocess.TimeoutExpired):
+                    self.signal_process(process, signal.SIGKILL)
+            if not isinstance(process, subprocess.Popen):
+                process.stdin.close()  # Let the transport finish before the loop closes
+                await process.wait()
+        except Exception as e:
+            self.logger.warning(f"Error terminating process: {str(e)}")
+
+    @staticmethod
+    def signal_process(process: ProcessLike, sig: int) -> None:
+        """Signal a subprocess; session leaders get the whole process group so helper children exit too."""
+        try:
+            if os.getpgid(process.pid) == process.pid:
+                os.killpg(process.pid, sig)
+            else:
+                process.send_signal(sig)
+        except ProcessLookupError:
+            pass
+
+    @staticmethod
+    def is_process_alive(process: ProcessLike) -> bool:
+        """Check whether a (Popen or asyncio) subprocess is still running."""
+        if isinstance(process, subprocess.Popen):
+            return process.poll() is None
+        return process.returncode is None
+
+    @staticmethod
+    async def wait_process(process: ProcessLike, timeout: float) -> None:
+        """Wait for a (Popen or asyncio) subprocess to exit without blocking the event loop."""
+        if isinstance(process, subprocess.Popen):
+            await asyncio.to_thread(process.wait, timeout)
+        else:
+            await asyncio.wait_for(process.wait(), timeout)
 
     def __enter__(self):
-        """Enter the runtime context for the tunnel."""
+        """Enter the runtime context for the tunnel, starting the event loop thread and all tunnel tasks."""
         if self._is_running:
             raise RuntimeError('Tunnel is already running by another method')
 
         if not self.tunnel_list:
             raise ValueError('No tunnels added')
 
-        print_job = Thread(target=self._print)
-        print_job.start()
-        self.jobs.append(print_job)
-
-        for tunnel in self.tunnel_list:
-            self.start_tunnel_thread(tunnel)
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = Thread(target=self._loop.run_forever, name='TunnelHub', daemon=True)
+        self._loop_thread.start()
+        self.run_in_loop(self._start_jobs())
 
         self._is_running = True
         return self
 
-    def start_tunnel_thread(self, tunnel: TunnelDict) -> None:
-        """Start a new thread for the specified tunnel."""
+    async def _start_jobs(self) -> None:
+        """Create the shared events and schedule the printer and one task per tunnel."""
+        self._port_ready = asyncio.Event()
+        self._urls_ready = asyncio.Event()
+        self.timeline.mark('TunnelHub', 'start')
+
+        if self.proxy_port:
+            self.proxy = ReverseProxy(self.proxy_port, self.port, logger=self.logger.getChild('proxy'))
+            await self.proxy.start()
+
+        self.jobs.append(asyncio.create_task(self._watch_port()))
+        self.jobs.append(asyncio.create_task(self._print()))
+        self.jobs.append(asyncio.create_task(self._watch_health()))
+
+        for tunnel in self.tunnel_list:
+            self.start_tunnel_task(tunnel)
+
+    def start_tunnel_task(self, tunnel: TunnelDict) -> None:
+        """Schedule a new task for the specified tunnel on the event loop."""
         try:
             cmd = tunnel['command'].format(port=self.port)
             name = tunnel.get('name')
-            tunnel_thread = Thread(target=self._run, args=(cmd, name))
-            tunnel_thread.start()
-            self.jobs.append(tunnel_thread)
+            self.jobs.append(asyncio.create_task(self._run(cmd, name, tunnel)))
         except Exception as e:
             self.logger.error(f"Failed to start tunnel {tunnel.get('name')}: {str(e)}")
 
@@ -264,8 +571,13 @@ class Tunnel:
         self.urls.clear()
         self.jobs.clear()
         self.processes.clear()
+        self.tunnel_processes.clear()
+        self.output_tails.clear()
         self.stop_event.clear()
         self.printed.clear()
+        self.port_failed = False
+        self._loop = self._loop_thread = None
+        self._port_ready = self._urls_ready = None
         self._is_running = False
 
     @staticmethod
@@ -278,53 +590,68 @@ class Tunnel:
         except Exception:
             return False
 
-    @staticmethod
-    def wait_for_condition(condition: Callable[[], bool], *, interval: int = 1, timeout: int = 10) -> bool:
-        """Wait for a condition to be true, checking at specified intervals."""
-        start_time = time.time()
-        elapsed_time = 0
-        checks_count = 0
-        timeout = max(1, timeout) if timeout is not None else None
-
-        while True:
-            if condition():
-                return True
+    def url_matcher(self) -> Optional[re.Pattern]:
+        """
+        Combined alternation of all tunnel patterns, one named group `__tunnel<index>` per tunnel.
 
-            checks_count += 1
-            elapsed_time = time.time() - start_time
-
-            if timeout is not None and elapsed_time >= timeout:
-                return False
-
-            next_interval = min(interval, (timeout - elapsed_time) / (checks_count + 1)) if timeout else interval
-            time.sleep(next_interval)
+        Built once per tunnel list; None if the patterns can't be combined (e.g. conflicting flags
+        or numbered backreferences), in which case lines are matched pattern by pattern.
+        """
+        if self._url_matcher is None:
+            patterns = [tunnel['pattern'] for tunnel in self.tunnel_list]
+            flags = {pattern.flags for pattern in patterns}
+            try:
+                if len(flags) != 1:
+                    raise re.error('patterns use different flags')
+                self._url_matcher = re.compile(
+                    '|'.join(f"(?P<__tunnel{i}>{pattern.pattern})" for i, pattern in enumerate(patterns)),
+                    flags.pop(),
+                )
+            except re.error:
+                self._url_matcher = False
+        return self._url_matcher or None
 
     def _process_line(self, line: str) -> bool:
-        """Process a line of output from the tunnel command to check for URLs."""
-        for tunnel in self.tunnel_list:
-            if self.extract_url(tunnel, line):
-                return True
+        """Process a line of output (from an unknown tunnel) in a single pass over all tunnel patterns."""
+        matcher = self.url_matcher()
+        if matcher is None:
+            return any(self.extract_url(tunnel, line) for tunnel in self.tunnel_list)
+
+        match = matcher.search(line)
+        if not match:
+            return False
+        for index, tunnel in enumerate(self.tunnel_list):
+            group = f"__tunnel{index}"
+            if match.start(group) != -1:
+                return self.register_url(tunnel, match.group(group))
         return False
 
     def extract_url(self, tunnel: TunnelDict, line: str) -> bool:
         """Extract a URL from a line of output based on the tunnel's regex pattern."""
-        regex = tunnel['pattern']
-        matches = regex.search(line)
-
-        if matches:
-            link = matches.group().strip()
-            link = link if link.startswith('http') else 'http://' + link
-            note = tunnel.get('note')
-            name = tunnel.get('name')
-            callback = tunnel.get('callback')
-
-            with self.urls_lock:
-                self.urls.append((link, note, name))
-
-            if callback:
-                self.invoke_callback(callback, link, note, name)
-            return True
-        return False
+        matches = tunnel['pattern'].search(line)
+        return self.register_url(tunnel, matches.group()) if matches else False
+
+    def register_url(self, tunnel: TunnelDict, link: str) -> bool:
+        """Store the URL of a tunnel (replacing a previous one after a reconnect) and invoke its callback."""
+        link = link.strip()
+        link = link if link.startswith('http') else 'http://' + link
+        note = tunnel.get('note')
+        name = tunnel.get('name')
+        callback = tunnel.get('callback')
+
+        self.timeline.mark(name, 'url')
+        with self.urls_lock:
+            reconnected = any(n == name for _, _, n in self.urls)
+            self.urls = [entry for entry in self.urls if entry[2] != name]  # A reconnect replaces the old URL
+            self.urls.append((link, note, name))
+            if self._urls_ready and len(self.urls) >= len(self.tunnel_list):
+                self._urls_ready.set()  # Wake the printer right away
+
+        if reconnected:
+            self.logger.info(f"🔄 Tunnel {name} reconnected: {link} {note or ''}")
+        if callback:
+            self.invoke_callback(callback, link, note, name)
+        return True
 
     def invoke_callback(self, callback: Callable, link: str, note: Optional[str], name: Optional[str]) -> None:
         """Invoke the provided callback with the extracted URL and its associated metadata."""
@@ -333,76 +660,271 @@ class Tunnel:
         except Exception:
             self.logger.error('An error occurred while invoking URL callback', exc_info=True)
 
-    def _run(self, cmd: str, name: str) -> None:
-        """Run the specified command in a subprocess, monitoring its output."""
+    async def _run(self, cmd: str, name: str, tunnel: TunnelDict = None) -> None:
+        """
+        Run the specified command in a subprocess (or adopt a handed off one), monitoring its output.
+
+        The tunnel is supervised: whenever its process exits while the tunnel is running it is started
+        again after a backoff (2s doubling up to 60s, reset once a process stayed up for 60s) and the
+        new URL replaces the old one, firing the tunnel's callback.
+        """
         log_path = self.log_dir / f"tunnel_{name}.log"
         log_path.write_text('')  # Clear previous log file
 
         log = self.logger.getChild(name)  # Create a child logger for this tunnel
-        self.setup_file_logging(log, log_path)  # Set up file logging for this tunnel
+        self.setup_file_logging(name, log_path)  # Set up file logging for this tunnel
 
+        failures = 0
         try:
-            self.wait_for_port_if_needed()
-            cmd = shlex.split(cmd)
-            process = subprocess.Popen(
-                cmd,
+            while not self.stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    await self._run_once(cmd, name, tunnel, log)
+                except Exception as e:
+                    log.error(f"Error in tunnel: {str(e)}", exc_info=self.debug)
+                    self.dump_output(name, log)
+
+                if self.stop_event.is_set() or not self.reconnect or self.port_failed:
+                    break
+
+                failures = 1 if time.monotonic() - started > 60 else failures + 1
+                delay = min(2 ** failures, 60)
+                self.logger.warning(f"Tunnel {name} exited, restarting in {delay}s")
+                await asyncio.sleep(delay)
+        finally:
+            self.log_router.remove(name)  # Flush and close this tunnel's log file
+
+    async def _run_once(self, cmd: str, name: str, tunnel: Optional[TunnelDict], log: logging.Logger) -> None:
+        """Adopt or spawn the tunnel process and monitor it until its output ends."""
+        drain = tunnel.pop('drain', None) if tunnel else None  # Belongs to the handed off process only
+        process = self.adopt_process(tunnel, log) if tunnel else None
+        url_extracted = process is not None
+        if not process:
+            drain = None
+
+        if not process:
+            if self.check_local_port and not self._port_ready.is_set():
+                self.timeline.mark(name, 'port_wait')
+                if not await self.wait_for_port_if_needed():
+                    return  # Port never came up (or stopping): nothing to tunnel to
+                self.timeline.mark(name, 'port_ready')
+            process = await asyncio.create_subprocess_exec(
+                *shlex.split(cmd),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 stdin=subprocess.PIPE,
-                universal_newlines=True,
-                bufsize=1,
+                start_new_session=True,
             )
+            self.timeline.mark(name, 'spawn')
             self.processes.append(process)
-            self.monitor_process_output(process, log)
 
-        except Exception as e:
-            log.error(f"Error in tunnel: {str(e)}", exc_info=self.debug)
+        self.tunnel_processes[name] = process
+        self.output_tails[name] = tail = deque(maxlen=50)
+        try:
+            await self.monitor_process_output(process, log, url_extracted=url_extracted, tail=tail, tunnel=tunnel,
+                                              drain=drain)
         finally:
-            for handler in log.handlers:
-                handler.close()  # Close any handlers associated with this logger
-
-    def setup_file_logging(self, log: logging.Logger, log_path: Path) -> None:
-        """Set up file logging for the specified logger and log file path."""
-        if not log.handlers:
-            handler = logging.FileHandler(log_path, encoding='utf-8')
-            handler.setLevel(logging.DEBUG)
-            handler.setFormatter(FileFormatter("[%(name)s]: %(message)s"))
-            log.addHandler(handler)
-
-    def wait_for_port_if_needed(self) -> None:
-        """Wait for the specified port to be available if the check_local_port flag is set."""
+            self.tunnel_processes.pop(name, None)
+            if not self.stop_event.is_set():
+                self.dump_output(name, log)
+                # Output ended (or the health monitor gave up on it): make sure it's gone before restarting
+                await self.terminate_process(process)
+                if process in self.processes:
+                    self.processes.remove(process)
+
+    def adopt_process(self, tunnel: TunnelDict, log: logging.Logger) -> Optional[subprocess.Popen]:
+        """Take over a handed off, still running process and register its already extracted URL."""
+        process, url = tunnel.get('process'), tunnel.get('url')
+        tunnel['process'] = None  # Adopt only once, restarts spawn the command
+        if not process or not url or process.poll() is not None:
+            return None
+
+        log.debug(f"Adopted running process (pid {process.pid})")
+        self.timeline.mark(tunnel['name'], 'adopted')
+        for line in tunnel.get('output') or []:
+            log.debug(line)
+
+        self.processes.append(process)
+        self.register_url(tunnel, url)
+        return process
+
+    def setup_file_logging(self, name: str, log_path: Path) -> None:
+        """Set up (buffered) file logging for the specified tunnel and log file path."""
+        self.log_router.add(name, log_path)
+
+    def dump_output(self, name: str, log: logging.Logger) -> None:
+        """Log the last output lines of a tunnel (kept in its ring buffer) as an error."""
+        tail = self.output_tails.get(name)
+        if tail:
+            log.error('Process ended, last output:\n' + '\n'.join(tail))
+            tail.clear()
+
+    @staticmethod
+    def is_port_listening(port: int) -> Optional[bool]:
+        """Check /proc/net/tcp and tcp6 for a LISTEN socket on the port, None if procfs is not available."""
+        readable = False
+        for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+            try:
+                with open(table, 'r') as f:
+                    next(f, None)  # Skip header
+                    for line in f:
+                        # sl local_address rem_address st ... (addresses are HEXIP:HEXPORT, st 0A = LISTEN)
+                        fields = line.split(None, 4)
+                        if len(fields) > 3 and fields[3] == '0A' and int(fields[1].rsplit(':', 1)[1], 16) == port:
+                            return True
+                readable = True
+            except (OSError, ValueError):
+                continue
+        return False if readable else None
+
+    async def port_listening(self) -> bool:
+        """Check the local port without opening connections to it, using a connect probe only without procfs."""
+        listening = self.is_port_listening(self.port)
+        if listening is None:
+            listening = await asyncio.to_thread(self.is_port_in_use, self.port)
+        return listening
+
+    async def _watch_port(self) -> None:
+        """
+        Single shared watcher that sets the port-ready event once the local port is listening.
+
+        Checks back off exponentially (50ms up to 0.5s), so readiness is noticed well within a second
+        while all tunnels and the printer just wait on the same event. Gives up after `port_timeout`
+        (setting `port_failed`) or when the tunnel is stopped; the event is set either way so no
+        waiter blocks forever.
+        """
         if self.check_local_port:
-            self.wait_for_condition(
-                lambda: self.is_port_in_use(self.port) or self.stop_event.is_set(),
-                interval=1,
-                timeout=None,
-            )
+            deadline = time.monotonic() + self.port_timeout if self.port_timeout else None
+            delay = 0.05
+            try:
+                while not await self.port_listening():
+                    if self.stop_event.is_set():
+                        return
+                    if deadline is not None and time.monotonic() >= deadline:
+                        self.port_failed = True
+                        self.timeline.mark('WebUI', 'port_timeout')
+                        self.logger.error(f"Port {self.port} is not listening after {self.port_timeout}s, "
+                                          'giving up on tunnels that wait for it')
+                        return
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 1.5, 0.5)
+                self.logger.debug(f"Port {self.port} is listening")
+                self.timeline.mark('WebUI', 'port_ready')
+            finally:
+                self._port_ready.set()
+        else:
+            self._port_ready.set()
+
+    async def wait_for_port_if_needed(self) -> bool:
+        """
+        Wait for the specified port to be available if the check_local_port flag is set.
+
+        Returns False if the port timed out or the tunnel is stopping, True otherwise.
+        """
+        if self.check_local_port:
+            await self._port_ready.wait()
+        return not (self.port_failed or self.stop_event.is_set())
+
+    @staticmethod
+    def is_url_alive(url: str, timeout: float = 15) -> bool:
+        """Probe a public tunnel URL; connection errors, gateway errors and provider 404 pages count as dead."""
+        try:
+            response = requests.get(url, headers=TUNNEL_HEADERS, timeout=timeout, stream=True)
+            with response:
+                if response.status_code in DEAD_TUNNEL_STATUS:
+                    return False
+                if response.status_code != 404:
+                    return True
+                head = response.raw.read(4096, decode_content=True).decode(errors='replace').lower()
+        except requests.RequestException:
+            return False
+        return not any(marker in head for marker in DEAD_TUNNEL_MARKERS)
+
+    async def _watch_health(self, strikes_limit: int = 3) -> None:
+        """Periodically probe every public URL and restart tunnels whose URL keeps failing."""
+        if not self.health_interval:
+            return
+
+        if not await self.wait_for_port_if_needed():
+            return
+        strikes: Dict[str, int] = {}
+        while True:
+            await asyncio.sleep(self.health_interval)
+            if not await self.port_listening():
+                continue  # WebUI itself is down, nothing the tunnels can fix
+
+            with self.urls_lock:
+                urls = list(self.urls)
+            alive = await asyncio.gather(*(asyncio.to_thread(self.is_url_alive, url) for url, _, _ in urls))
 
-    def monitor_process_output(self, process: subprocess.Popen, log: logging.Logger) -> None:
-        """Monitor the output of the subprocess and process any lines received."""
-        url_extracted = False
-        while not self.stop_event.is_set() and process.poll() is None:
-            line = process.stdout.readline()
+            for (url, _, name), ok in zip(urls, alive):
+                strikes[name] = 0 if ok else strikes.get(name, 0) + 1
+                process = self.tunnel_processes.get(name)
+                if strikes[name] >= strikes_limit and process:
+                    self.logger.warning(f"Tunnel {name} is unreachable ({url}), reconnecting")
+                    strikes[name] = 0
+                    await self.terminate_process(process)  # Supervisor in _run starts it again
+
+    @staticmethod
+    def line_reader(process: ProcessLike, drain: Optional[PipeDrain] = None) -> Callable[[], Awaitable[str]]:
+        """Return an awaitable readline for the process stdout (Popen pipes are read in a worker thread)."""
+        if drain is not None:
+            return lambda: asyncio.to_thread(drain.readline)
+        if isinstance(process, subprocess.Popen):
+            return lambda: asyncio.to_thread(process.stdout.readline)
+
+        async def readline() -> str:
+            return (await process.stdout.readline()).decode('utf-8', errors='replace')
+        return readline
+
+    async def monitor_process_output(self, process: ProcessLike, log: logging.Logger, url_extracted: bool = False,
+                                     tail: Optional[deque] = None, tunnel: Optional[TunnelDict] = None,
+                                     drain: Optional[PipeDrain] = None) -> None:
+        """Monitor the output of the subprocess; lines are matched against its own tunnel's pattern only."""
+        readline = self.line_reader(process, drain)
+        first_output = tunnel is not None
+        while not self.stop_event.is_set():
+            line = await readline()
             if not line:
                 break
+            if first_output:
+                self.timeline.mark(tunnel['name'], 'first_output')
+                first_output = False
             if not url_extracted:
-                url_extracted = self._process_line(line)
-            log.debug(line.rstrip())
-
-    def _print(self) -> None:
-        """Print the collected tunnel URLs."""
-        if self.check_local_port:
-            self.wait_for_port_if_needed()
+                url_extracted = self.extract_url(tunnel, line) if tunnel else self._process_line(line)
+            line = line.rstrip()
+            if tail is not None:
+                tail.append(line)
+            log.debug(line)  # Only enqueued, written by the log listener thread
+
+    async def _print(self) -> None:
+        """Print the collected tunnel URLs as soon as all of them are known (or on timeout)."""
+        if not await self.wait_for_port_if_needed():
+            if self.port_failed:
+                self.timeline.mark('TunnelHub', 'display')
+                self.report_timeline()
+                self.printed.set()  # Unblock start(): there is nothing to print
+            return
 
-        if not self.wait_for_condition(
-            lambda: len(self.urls) == len(self.tunnel_list) or self.stop_event.is_set(),
-            interval=1,
-            timeout=self.timeout,
-        ):
+        try:
+            await asyncio.wait_for(self._urls_ready.wait(), timeout=self.timeout)
+        except asyncio.TimeoutError:
             self.logger.warning('Timeout while getting tunnel URLs, print available URLs')
 
         if not self.stop_event.is_set():
             self.display_urls()
+            self.timeline.mark('TunnelHub', 'display')
+            self.report_timeline()
+
+    def report_timeline(self) -> None:
+        """Write the start-up timeline next to the tunnel logs and print its waterfall."""
+        try:
+            self.timeline.dump(self.timeline_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write timeline: {e}")
+        waterfall = self.timeline.waterfall()
+        if waterfall:
+            print(f"\033[33m>> Tunnel timeline:\033[0m\n{waterfall}\n")
 
     def display_urls(self) -> None:
         """Display the collected URLs in a formatted manner."""
@@ -423,4 +945,572 @@ class Tunnel:
             if self.callback:
                 self.invoke_callback(self.callback, self.urls)
 
-            self.printed.set()
\ No newline at end of file
+            self.printed.set()
+
+
+class Timeline:
+    """
+    Monotonic phase timestamps per provider (e.g. port_wait, spawn, first_output, url, display).
+
+    Thread-safe, so launch.py probes and the TunnelHub loop can share one instance. Exported as a
+    JSON timeline and printed as a compact waterfall to show where tunnel start-up time goes.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.started_at = time.time()
+        self.marks: Dict[str, List[Tuple[str, float]]] = {}
+        self.lock = Lock()
+
+    def mark(self, provider: str, phase: str) -> float:
+        """Record a phase for a provider, returns seconds since the timeline started."""
+        elapsed = time.monotonic() - self.origin
+        with self.lock:
+            self.marks.setdefault(provider, []).append((phase, elapsed))
+        return elapsed
+
+    def first(self, provider: str, phase: str) -> Optional[float]:
+        with self.lock:
+            return next((t for p, t in self.marks.get(provider, []) if p == phase), None)
+
+    def as_dict(self) -> dict:
+        with self.lock:
+            return {
+                'started_at': self.started_at,
+                'providers': {
+                    provider: [{'phase': phase, 't': round(t, 4)} for phase, t in marks]
+                    for provider, marks in self.marks.items()
+                },
+            }
+
+    def dump(self, path: StrOrPath) -> None:
+        """Write the timeline as JSON."""
+        Path(path).write_text(json.dumps(self.as_dict(), indent=2), encoding='utf-8')
+
+    def waterfall(self, width: int = 40) -> str:
+        """One line per provider: a bar from its first to its last phase and the phase offsets."""
+        with self.lock:
+            marks = {provider: list(items) for provider, items in self.marks.items() if items}
+        if not marks:
+            return ''
+
+        end = max(t for items in marks.values() for _, t in items) or 1e-9
+        name_width = max(len(provider) for provider in marks)
+        lines = []
+        for provider, items in marks.items():
+            start, stop = items[0][1], items[-1][1]
+            left = min(int(start / end * width), width - 1)
+            right = max(left + 1, int(round(stop / end * width)))
+            bar = ' ' * left + '█' * (right - left) + ' ' * (width - right)
+            phases = ' '.join(f"{phase}@{t:.2f}s" for phase, t in items)
+            lines.append(f"{provider:<{name_width}} |{bar}| {phases}")
+        return '\n'.join(lines)
+
+
+BENCH_PATH = '/__anxlight_bench'
+DEAD_TUNNEL_STATUS = {502, 503, 504, 530}         # Gateway answers of providers whose tunnel is gone
+# Provider error pages that come back with a plain 404 (the WebUI itself may legitimately 404 at /)
+DEAD_TUNNEL_MARKERS = ('err_ngrok_3200', 'tunnel not found', 'no tunnel here', 'tunnel is offline')
+TUNNEL_HEADERS = {
+    'bypass-tunnel-reminder': '1',        # Localtunnel password page
+    'ngrok-skip-browser-warning': '1',    # Ngrok browser warning
+    'skip_zrok_interstitial': '1',        # Zrok interstitial page
+}
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    """Benchmark endpoints: GET ping, GET down?size=N (random bytes), POST up (returns received size)."""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    max_size = 8 * 1024 * 1024
+    payload = b''  # Random (incompressible) bytes, so tunnel compression can't skew throughput
+
+    def _reply(self, body: bytes, content_type: str = 'application/octet-stream') -> None:
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        if path == f"{BENCH_PATH}/ping":
+            self._reply(b'pong', 'text/plain')
+        elif path == f"{BENCH_PATH}/down":
+            size = dict(p.partition('=')[::2] for p in query.split('&')).get('size', '0')
+            self._reply(self.payload[:min(int(size or 0), self.max_size)])
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path != f"{BENCH_PATH}/up":
+            self.send_error(404)
+            return
+        size = int(self.headers.get('Content-Length') or 0)
+        received = len(self.rfile.read(min(size, self.max_size)))
+        self._reply(str(received).encode(), 'text/plain')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _DualStackServer(ThreadingHTTPServer):
+    address_family = socket.AF_INET6
+    daemon_threads = True
+
+    def server_bind(self):
+        self.socket.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)  # Accept 127.0.0.1 and ::1
+        super().server_bind()
+
+
+class EchoServer:
+    """
+    Local stand-in for the WebUI used to benchmark tunnels before the WebUI binds the port.
+
+    Usage:
+        with EchoServer(7860):
+            result = benchmark_url('https://xxx.trycloudflare.com')
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[Thread] = None
+
+    def start(self) -> None:
+        if not _EchoHandler.payload:
+            _EchoHandler.payload = os.urandom(_EchoHandler.max_size)
+        try:
+            self.server = _DualStackServer(('::', self.port), _EchoHandler)
+        except OSError:
+            self.server = ThreadingHTTPServer(('127.0.0.1', self.port), _EchoHandler)
+            self.server.daemon_threads = True
+        self.thread = Thread(target=self.server.serve_forever, name='TunnelHub-echo', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.thread.join()
+            self.server = self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.stop()
+
+
+def benchmark_url(url: str, *, samples: int = 3, payload: int = 256 * 1024, timeout: float = 10.0) -> dict:
+    """
+    Measure a public tunnel URL against a running EchoServer.
+
+    Returns a dict with the median round trip time `rtt` (s), `down`/`up` throughput (bytes/s)
+    and a `score`: the estimated time (s) for a ping plus one payload each way, lower is better.
+    Raises on HTTP errors or when the tunnel serves something else (e.g. an interstitial page).
+    """
+    base = (url if url.startswith('http') else 'https://' + url).rstrip('/') + BENCH_PATH
+
+    with requests.Session() as session:
+        session.headers.update(TUNNEL_HEADERS)
+
+        rtts = []
+        for _ in range(samples + 1):  # First request only warms up the connection (DNS, TLS)
+            start = time.perf_counter()
+            response = session.get(f"{base}/ping", timeout=timeout)
+            response.raise_for_status()
+            if response.content != b'pong':
+                raise ValueError('Unexpected ping response')
+            rtts.append(time.perf_counter() - start)
+        rtt = statistics.median(rtts[1:])
+
+        start = time.perf_counter()
+        response = session.get(f"{base}/down", params={'size': payload}, timeout=timeout)
+        response.raise_for_status()
+        if len(response.content) != payload:
+            raise ValueError('Incomplete download')
+        down = payload / max(time.perf_counter() - start, 1e-6)
+
+        start = time.perf_counter()
+        response = session.post(f"{base}/up", data=os.urandom(payload), timeout=timeout)
+        response.raise_for_status()
+        if response.text.strip() != str(payload):
+            raise ValueError('Incomplete upload')
+        up = payload / max(time.perf_counter() - start, 1e-6)
+
+    return {'rtt': rtt, 'down': down, 'up': up, 'score': rtt + payload / down + payload / up}
+
+
+HOP_HEADERS = {
+    'connection', 'keep-alive', 'proxy-connection', 'proxy-authenticate', 'proxy-authorization',
+    'te', 'trailer', 'transfer-encoding', 'upgrade', 'expect',
+}
+
+Headers = List[Tuple[str, str]]
+
+
+class ReverseProxy:
+    """
+    Local asyncio HTTP/1.1 reverse proxy between the tunnels and the WebUI.
+
+    - Compresses text-like responses (brotli when the module is installed, otherwise gzip) for
+      clients that accept it, so JS/CSS/JSON crosses the slow free tunnels compressed.
+    - Caches static assets (by path) for `cache_ttl` seconds with an ETag, answering repeat
+      requests from memory and revalidations with 304 without touching the WebUI. Only
+      credential-less requests and publicly cacheable responses use the shared cache.
+    - Passes websocket (Upgrade) connections through as raw byte streams, and streams
+      everything it doesn't buffer (SSE, uploads, large files) chunk by chunk.
+    """
+
+    COMPRESSIBLE_TYPES = (
+        'text/', 'application/javascript', 'application/x-javascript', 'application/json',
+        'application/xml', 'application/manifest+json', 'application/wasm', 'image/svg+xml',
+    )
+    STATIC_SUFFIXES = (
+        '.js', '.mjs', '.css', '.map', '.json', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg',
+        '.ico', '.woff', '.woff2', '.ttf', '.wasm', '.mp3',
+    )
+
+    def __init__(self, port: int, upstream_port: int, *, upstream_host: str = '127.0.0.1',
+                 min_size: int = 1024, max_buffer: int = 8 * 1024 * 1024,
+                 cache_ttl: float = 600, cache_limit: int = 128 * 1024 * 1024,
+                 logger: Optional[logging.Logger] = None):
+        self.port = port
+        self.upstream = (upstream_host, upstream_port)
+        self.min_size = min_size
+        self.max_buffer = max_buffer
+        self.cache_ttl = cache_ttl
+        self.cache_limit = cache_limit
+        self.cache: OrderedDict = OrderedDict()
+        self.cache_bytes = 0
+        self.connections = set()
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.logger = logger or logging.getLogger('TunnelHub.proxy')
+
+    # ---- Lifecycle ----
+
+    async def start(self) -> None:
+        """Listen on localhost (IPv4 and, when available, IPv6)."""
+        try:
+            self.server = await asyncio.start_server(self.handle_client, ['127.0.0.1', '::1'], self.port)
+        except OSError:
+            self.server = await asyncio.start_server(self.handle_client, '127.0.0.1', self.port)
+        self.logger.debug(f"Reverse proxy :{self.port} -> {self.upstream[0]}:{self.upstream[1]}")
+
+    async def stop(self) -> None:
+        if self.server:
+            self.server.close()
+            for writer in list(self.connections):
+                writer.close()
+            await self.server.wait_closed()
+            self.server = None
+
+    # ---- HTTP helpers ----
+
+    @staticmethod
+    async def read_head(reader: asyncio.StreamReader) -> Optional[Tuple[str, Headers, bytes]]:
+        """Read a request/status line and headers; None on a cleanly closed connection."""
+        try:
+            raw = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError:
+            return None
+        lines = raw.decode('latin-1').split('\r\n')
+        headers = []
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers.append((name.strip(), value.strip()))
+        return lines[0], headers, raw
+
+    @staticmethod
+    def header(headers: Headers, name: str, default: str = '') -> str:
+        name = name.lower()
+        return next((value for key, value in headers if key.lower() == name), default)
+
+    @staticmethod
+    def build_head(first_line: str, headers: Headers) -> bytes:
+        return (first_line + '\r\n' + ''.join(f"{k}: {v}\r\n" for k, v in headers) + '\r\n').encode('latin-1')
+
+    def accepted_encoding(self, headers: Headers) -> Optional[str]:
+        """Best encoding we can produce for the client's Accept-Encoding."""
+        accepted = set()
+        for token in self.header(headers, 'Accept-Encoding').split(','):
+            name, _, params = token.strip().partition(';')
+            if params.strip().replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                accepted.add(name.strip().lower())
+        if brotli and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def compress(body: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(body, quality=5)
+        return gzip.compress(body, compresslevel=6, mtime=0)
+
+    @staticmethod
+    async def relay_body(src: asyncio.StreamReader, dst: asyncio.StreamWriter, headers: Headers,
+                         until_eof: bool = False) -> None:
+        """Copy a message body as-is (chunked framing, Content-Length or until EOF)."""
+        if 'chunked' in ReverseProxy.header(headers, 'Transfer-Encoding').lower():
+            while True:
+                line = await src.readuntil(b'\r\n')
+                dst.write(line)
+                size = int(line.split(b';', 1)[0].strip(), 16)
+                if size == 0:
+                    while True:  # Trailers end with an empty line
+                        line = await src.readuntil(b'\r\n')
+                        dst.write(line)
+                        if line == b'\r\n':
+                            await dst.drain()
+                            return
+                dst.write(await src.readexactly(size + 2))
+                await dst.drain()
+
+        length = ReverseProxy.header(headers, 'Content-Length')
+        if length:
+            remaining = int(length)
+            while remaining > 0:
+                chunk = await src.read(min(remaining, 65536))
+                if not chunk:
+                    raise ConnectionError('Connection closed mid-body')
+                dst.write(chunk)
+                remaining -= len(chunk)
+                await dst.drain()
+        elif until_eof:
+            while chunk := await src.read(65536):
+                dst.write(chunk)
+                await dst.drain()
+
+    @staticmethod
+    async def pipe(src: asyncio.StreamReader, dst: asyncio.StreamWriter) -> None:
+        try:
+            while chunk := await src.read(65536):
+                dst.write(chunk)
+                await dst.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            dst.close()
+
+    # ---- Cache ----
+
+    def is_static(self, target: str) -> bool:
+        # Not /file=: A1111 serves user files and outputs there, which must never be shared between clients
+        path = target.split('?', 1)[0].lower()
+        if path.startswith('/file='):
+            return False
+        return path.endswith(self.STATIC_SUFFIXES) or '/assets/' in path
+
+    def is_shared_request(self, headers: Headers) -> bool:
+        """Requests carrying credentials (e.g. --gradio-auth cookies) never read or fill the shared cache."""
+        return not (self.header(headers, 'Authorization') or self.header(headers, 'Cookie'))
+
+    def is_shared_response(self, headers: Headers) -> bool:
+        cache_control = self.header(headers, 'Cache-Control').lower()
+        return not (
+            any(directive in cache_control for directive in ('no-store', 'no-cache', 'private'))
+            or self.header(headers, 'Vary') or self.header(headers, 'Set-Cookie')
+        )
+
+    def cache_get(self, target: str) -> Optional[dict]:
+        entry = self.cache.get(target)
+        if entry and time.monotonic() - entry['time'] < self.cache_ttl:
+            self.cache.move_to_end(target)
+            return entry
+        return None
+
+    def cache_put(self, target: str, entry: dict) -> None:
+        size = len(entry['body'])
+        if size > self.cache_limit // 4:
+            return
+        old = self.cache.pop(target, None)
+        if old:
+            self.cache_bytes -= len(old['body'])
+        self.cache[target] = entry
+        self.cache_bytes += size
+        while self.cache_bytes > self.cache_limit:
+            _, dropped = self.cache.popitem(last=False)
+            self.cache_bytes -= len(dropped['body'])
+
+    def make_entry(self, status_line: str, headers: Headers, body: bytes) -> dict:
+        etag = self.header(headers, 'ETag') or f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+        content_type = self.header(headers, 'Content-Type').lower()
+        keep = [(k, v) for k, v in headers if k.lower() not in HOP_HEADERS | {'content-length', 'etag'}]
+        return {
+            'status_line': status_line,
+            'headers': keep,
+            'body': body,
+            'etag': etag,
+            'compressible': content_type.startswith(self.COMPRESSIBLE_TYPES) and len(body) >= self.min_size,
+            'encoded': {},
+            'time': time.monotonic(),
+        }
+
+    async def send_entry(self, writer: asyncio.StreamWriter, entry: dict, request_headers: Headers,
+                         method: str, keep_alive: bool) -> None:
+        """Answer from a buffered response: 304 on a matching ETag, else (compressed) full body."""
+        connection = [('Connection', 'keep-alive' if keep_alive else 'close')]
+        if_none_match = self.header(request_headers, 'If-None-Match')
+        if if_none_match and entry['etag'] in (tag.strip() for tag in if_none_match.split(',')):
+            writer.write(self.build_head('HTTP/1.1 304 Not Modified', [('ETag', entry['etag'])] + connection))
+            await writer.drain()
+            return
+
+        body, headers = entry['body'], list(entry['headers'])
+        encoding = self.accepted_encoding(request_headers) if entry['compressible'] else None
+        if encoding:
+            encoded = entry['encoded'].get(encoding)
+            if encoded is None:
+                if len(body) > 65536:
+                    encoded = await asyncio.to_thread(self.compress, body, encoding)
+                else:
+                    encoded = self.compress(body, encoding)
+                entry['encoded'][encoding] = encoded
+            body = encoded
+            headers.append(('Content-Encoding', encoding))
+        if entry['compressible']:
+            headers = self.add_vary(headers, 'Accept-Encoding')
+
+        headers += [('ETag', entry['etag']), ('Content-Length', str(len(body)))] + connection
+        writer.write(self.build_head(entry['status_line'], headers))
+        if method != 'HEAD':
+            writer.write(body)
+        await writer.drain()
+
+    @staticmethod
+    def add_vary(headers: Headers, field: str) -> Headers:
+        """Merge field into the (single) Vary header instead of sending a second one."""
+        values, rest = [], []
+        for k, v in headers:
+            if k.lower() == 'vary':
+                values += [value.strip() for value in v.split(',') if value.strip()]
+            else:
+                rest.append((k, v))
+        if '*' not in values and field.lower() not in (value.lower() for value in values):
+            values.append(field)
+        return rest + [('Vary', ', '.join(values))]
+
+    # ---- Connections ----
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections.add(writer)
+        upstream: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None
+        try:
+            while True:
+                request = await self.read_head(reader)
+                if request is None:
+                    break
+                request_line, headers, raw = request
+                method, target, version = (request_line.split(' ', 2) + ['', ''])[:3]
+
+                if self.header(headers, 'Upgrade'):
+                    await self.passthrough(reader, writer, raw)
+                    break
+
+                keep_alive = (self.header(headers, 'Connection').lower() != 'close') and version != 'HTTP/1.0'
+                static = method in ('GET', 'HEAD') and self.is_static(target)
+                entry = self.cache_get(target) if static and self.is_shared_request(headers) else None
+                if entry:
+                    await self.send_entry(writer, entry, headers, method, keep_alive)
+                    if not keep_alive:
+                        break
+                    continue
+
+                if upstream is None or upstream[1].is_closing():
+                    try:
+                        upstream = await asyncio.open_connection(*self.upstream)
+                    except OSError:
+                        writer.write(self.build_head('HTTP/1.1 502 Bad Gateway', [
+                            ('Content-Length', '0'), ('Connection', 'close')
+                        ]))
+                        await writer.drain()
+                        break
+
+                keep_alive = await self.forward(reader, writer, upstream, method, target, headers, keep_alive, static)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            self.logger.debug(f"Proxy connection error: {e}")
+        finally:
+            self.connections.discard(writer)
+            if upstream:
+                upstream[1].close()
+            writer.close()
+
+    async def forward(self, reader, writer, upstream, method: str, target: str, headers: Headers,
+                      keep_alive: bool, static: bool) -> bool:
+        """Forward one request upstream and relay (or buffer, compress and cache) the response."""
+        up_reader, up_writer = upstream
+
+        if self.header(headers, 'Expect').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+
+        forwarded = [(k, v) for k, v in headers if k.lower() not in HOP_HEADERS | {'accept-encoding'}]
+        if 'chunked' in self.header(headers, 'Transfer-Encoding').lower():
+            forwarded.append(('Transfer-Encoding', 'chunked'))
+        forwarded += [('Accept-Encoding', 'identity'), ('Connection', 'keep-alive')]
+        up_writer.write(self.build_head(f"{method} {target} HTTP/1.1", forwarded))
+        await self.relay_body(reader, up_writer, headers)
+        await up_writer.drain()
+
+        response = await self.read_head(up_reader)
+        while response and response[0].split(' ', 2)[1].startswith('1'):  # Skip interim responses
+            response = await self.read_head(up_reader)
+        if response is None:
+            raise ConnectionError('Upstream closed the connection')
+        status_line, resp_headers, _ = response
+        status = int(status_line.split(' ', 2)[1])
+
+        upstream_close = self.header(resp_headers, 'Connection').lower() == 'close'
+        length = self.header(resp_headers, 'Content-Length')
+        chunked = 'chunked' in self.header(resp_headers, 'Transfer-Encoding').lower()
+        no_body = method == 'HEAD' or status in (204, 304)
+
+        content_type = self.header(resp_headers, 'Content-Type').lower()
+        buffer = (
+            method == 'GET' and status == 200 and length and int(length) <= self.max_buffer
+            and not self.header(resp_headers, 'Content-Encoding')
+            and (static or content_type.startswith(self.COMPRESSIBLE_TYPES))
+        )
+        if buffer:
+            body = await up_reader.readexactly(int(length))
+            if upstream_close:
+                up_writer.close()
+            entry = self.make_entry(status_line, resp_headers, body)
+            if static and self.is_shared_request(headers) and self.is_shared_response(resp_headers):
+                self.cache_put(target, entry)
+            await self.send_entry(writer, entry, headers, method, keep_alive)
+            return keep_alive
+
+        # Stream through unchanged; a close-delimited body also ends the client connection
+        close_delimited = not (no_body or length or chunked)
+        keep_alive = keep_alive and not close_delimited
+        out = [(k, v) for k, v in resp_headers if k.lower() not in HOP_HEADERS]
+        if chunked:
+            out.append(('Transfer-Encoding', 'chunked'))
+        out.append(('Connection', 'keep-alive' if keep_alive else 'close'))
+        writer.write(self.build_head(status_line, out))
+        if not no_body:
+            await self.relay_body(up_reader, writer, resp_headers, until_eof=close_delimited)
+        await writer.drain()
+
+        if upstream_close or close_delimited:
+            up_writer.close()
+        return keep_alive
+
+    async def passthrough(self, reader, writer, raw_head: bytes) -> None:
+        """Websocket/Upgrade: hand the raw request to the WebUI and pipe bytes both ways."""
+        try:
+            up_reader, up_writer = await asyncio.open_connection(*self.upstream)
+        except OSError:
+            writer.write(b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\nConnection: close\r\n\r\n')
+            await writer.drain()
+            return
+        up_writer.write(raw_head)
+        await asyncio.gather(self.pipe(reader, up_writer), self.pipe(up_reader, writer))
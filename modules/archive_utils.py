@@ -0,0 +1,479 @@
+""" Archive Utilities Module | by ANXETY """
+
+from modules.trace_utils import span      # Install tracing
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+from dataclasses import dataclass
+from pathlib import Path
+import multiprocessing
+import threading
+import requests
+import zipfile
+import struct
+import heapq
+import time
+import stat
+import zlib
+import sys
+import os
+
+
+CHUNK_SIZE = 1024 * 1024                # Network read size
+SPAN_SIZE = 16 * 1024 * 1024            # Contiguous bytes fetched by one range request
+TAIL_SIZE = 64 * 1024 + 22              # Max EOCD record incl. comment
+PARALLEL_MIN_SIZE = 8 * 1024 * 1024     # Smaller archives are extracted in-process
+USER_AGENT = {'User-Agent': 'Mozilla/5.0'}
+RAW_METHODS = (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)   # Inflated from raw bytes; others go through zipfile
+
+
+# ======================= ZIP LAYOUT =======================
+
+@dataclass(slots=True)
+class ZipMember:
+    """Central directory entry (only what extraction needs)"""
+    name: str
+    method: int
+    crc: int
+    compressed_size: int
+    file_size: int
+    offset: int             # Local header offset
+    mode: int               # Unix mode from external attributes (0 if unknown)
+    date_time: tuple
+    end: int = 0            # Start of the next member / central directory
+
+    @property
+    def is_dir(self) -> bool:
+        return self.name.endswith('/') or stat.S_ISDIR(self.mode)
+
+    @property
+    def is_symlink(self) -> bool:
+        return stat.S_ISLNK(self.mode)
+
+
+def _parse_eocd(tail: bytes, tail_offset: int) -> tuple[int, int, int]:
+    """Return (central directory offset, size, entry count) from the archive tail (ZIP64 aware)"""
+    pos = tail.rfind(b'PK\x05\x06')
+    if pos < 0:
+        raise zipfile.BadZipFile('End of central directory not found')
+    _, _, _, _, count, cd_size, cd_offset, _ = struct.unpack('<4s4H2LH', tail[pos:pos + 22])
+
+    locator = pos - 20
+    if locator >= 0 and tail[locator:locator + 4] == b'PK\x06\x07':
+        (eocd64_offset,) = struct.unpack('<Q', tail[locator + 8:locator + 16])
+        rel = eocd64_offset - tail_offset
+        if rel < 0:
+            raise zipfile.BadZipFile('ZIP64 record outside fetched tail')
+        count, cd_size, cd_offset = struct.unpack('<QQQ', tail[rel + 32:rel + 56])
+    return cd_offset, cd_size, count
+
+
+def _dos_datetime(date: int, time_: int) -> tuple:
+    return (
+        (date >> 9) + 1980, (date >> 5) & 0xF, date & 0x1F,
+        time_ >> 11, (time_ >> 5) & 0x3F, (time_ & 0x1F) * 2
+    )
+
+
+def parse_central_directory(data: bytes, cd_offset: int) -> list[ZipMember]:
+    """Parse central directory records, members sorted by offset with their byte ranges"""
+    members, pos = [], 0
+    while pos + 46 <= len(data) and data[pos:pos + 4] == b'PK\x01\x02':
+        (_, made_by, _, flags, method, mtime, mdate, crc, csize, usize,
+         name_len, extra_len, comment_len, _, _, ext_attr, offset) = struct.unpack(
+            '<4s6H3L5HLL', data[pos:pos + 46]
+        )
+        name_raw = data[pos + 46:pos + 46 + name_len]
+        extra = data[pos + 46 + name_len:pos + 46 + name_len + extra_len]
+        name = name_raw.decode('utf-8' if flags & 0x800 else 'cp437')
+
+        # ZIP64 extra field: values are present only for fields set to 0xFFFFFFFF
+        i = 0
+        while i + 4 <= len(extra):
+            tag, size = struct.unpack('<HH', extra[i:i + 4])
+            if tag == 0x0001:
+                values = iter(struct.unpack(f"<{size // 8}Q", extra[i + 4:i + 4 + size - size % 8]))
+                if usize == 0xFFFFFFFF:
+                    usize = next(values)
+                if csize == 0xFFFFFFFF:
+                    csize = next(values)
+                if offset == 0xFFFFFFFF:
+                    offset = next(values)
+                break
+            i += 4 + size
+
+        mode = (ext_attr >> 16) if (made_by >> 8) == 3 else 0
+        members.append(ZipMember(name, method, crc, csize, usize, offset, mode, _dos_datetime(mdate, mtime)))
+        pos += 46 + name_len + extra_len + comment_len
+
+    members.sort(key=lambda m: m.offset)
+    for member, following in zip(members, members[1:] + [None]):
+        member.end = following.offset if following else cd_offset
+    return members
+
+
+def plan_spans(members: list[ZipMember], span_size: int = SPAN_SIZE) -> list[list[ZipMember]]:
+    """Group members into contiguous byte spans of roughly span_size (one range request each)"""
+    spans, current, current_start = [], [], 0
+    for member in members:
+        if current and member.end - current_start > span_size:
+            spans.append(current)
+            current = []
+        if not current:
+            current_start = member.offset
+        current.append(member)
+    if current:
+        spans.append(current)
+    return spans
+
+
+# ======================= EXTRACTION =======================
+
+def safe_target(dest: Path, name: str) -> Path:
+    """Resolve member path inside dest, rejecting absolute paths and traversal"""
+    # Resolve the parent only: the member itself may be a symlink that must not be followed
+    path = dest / name
+    target = path.parent.resolve() / path.name
+    if target != dest and dest not in target.parents:
+        raise zipfile.BadZipFile(f"Unsafe member path: {name}")
+    return target
+
+
+class _ByteStream:
+    """Sequential reader over an iterator of byte chunks, tracking the absolute archive offset"""
+
+    def __init__(self, chunks: Iterator[bytes], offset: int):
+        self.chunks = chunks
+        self.offset = offset
+        self.buffer = b''
+
+    def _fill(self) -> bool:
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            return False
+        self.buffer += chunk
+        return True
+
+    def read(self, size: int) -> bytes:
+        while len(self.buffer) < size:
+            if not self._fill():
+                raise EOFError('Stream ended early')
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        self.offset += size
+        return data
+
+    def iter_read(self, size: int) -> Iterator[bytes]:
+        """Yield exactly size bytes as they arrive"""
+        while size > 0:
+            if not self.buffer and not self._fill():
+                raise EOFError('Stream ended early')
+            data, self.buffer = self.buffer[:size], self.buffer[size:]
+            self.offset += len(data)
+            size -= len(data)
+            yield data
+
+    def skip_to(self, offset: int) -> None:
+        if offset < self.offset:
+            raise zipfile.BadZipFile('Overlapping members')
+        for _ in self.iter_read(offset - self.offset):
+            pass
+
+
+def extract_member(member: ZipMember, chunks: Iterator[bytes], dest: Path, *, decompressed: bool = False) -> None:
+    """
+    Write one member from its data chunks, verifying CRC and keeping mode/mtime/symlinks
+
+    Chunks are the raw (stored/deflated) member data, or already decompressed
+    data when decompressed=True (other methods read through zipfile).
+    """
+    target = safe_target(dest, member.name)
+    if member.is_dir:
+        for _ in chunks:
+            pass
+        target.mkdir(parents=True, exist_ok=True)
+        return
+
+    if decompressed or member.method == zipfile.ZIP_STORED:
+        decompressor = None
+    elif member.method == zipfile.ZIP_DEFLATED:
+        decompressor = zlib.decompressobj(-15)
+    else:
+        raise zipfile.BadZipFile(f"Unsupported compression method {member.method} for {member.name}")
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if target.is_symlink() or (member.is_symlink and target.exists()):
+        target.unlink()
+
+    crc, link_target = 0, b''
+    with (open(target, 'wb') if not member.is_symlink else open(os.devnull, 'wb')) as f:
+        for chunk in chunks:
+            data = decompressor.decompress(chunk) if decompressor else chunk
+            crc = zlib.crc32(data, crc)
+            if member.is_symlink:
+                link_target += data
+            else:
+                f.write(data)
+        if decompressor:
+            data = decompressor.flush()
+            crc = zlib.crc32(data, crc)
+            if member.is_symlink:
+                link_target += data
+            else:
+                f.write(data)
+
+    if crc != member.crc:
+        raise zipfile.BadZipFile(f"CRC mismatch for {member.name}")
+
+    if member.is_symlink:
+        os.symlink(link_target.decode('utf-8'), target)
+        return
+    if member.mode & 0o7777:
+        os.chmod(target, member.mode & 0o7777)
+    mtime = time.mktime(member.date_time + (0, 0, -1))
+    os.utime(target, (mtime, mtime))
+
+
+# ===================== STREAM INSTALL =====================
+
+_local = threading.local()
+
+def _session(headers: dict) -> requests.Session:
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = _local.session = requests.Session()
+    session.headers.update(headers)
+    return session
+
+def _fetch(url: str, start: int, end: int, headers: dict) -> requests.Response:
+    """
+    Start streaming bytes [start, end) of url with a range request
+
+    The caller must close the response (use it as a context manager), also
+    when it stops reading early, so the pooled connection is released.
+    """
+    response = _session(headers).get(url, headers={'Range': f"bytes={start}-{end - 1}"}, stream=True, timeout=60)
+    if response.status_code != 206:
+        response.close()
+        raise IOError(f"Range request not honoured (HTTP {response.status_code})")
+    return response
+
+def _fetch_bytes(url: str, start: int, end: int, headers: dict) -> bytes:
+    with _fetch(url, start, end, headers) as response:
+        return b''.join(response.iter_content(CHUNK_SIZE))
+
+def _extract_span(url: str, span: list[ZipMember], dest: Path, headers: dict) -> int:
+    """Fetch one contiguous span and extract its members while the bytes arrive"""
+    with _fetch(url, span[0].offset, span[-1].end, headers) as response:
+        stream = _ByteStream(response.iter_content(CHUNK_SIZE), span[0].offset)
+        for member in span:
+            stream.skip_to(member.offset)
+            header = stream.read(30)
+            if header[:4] != b'PK\x03\x04':
+                raise zipfile.BadZipFile(f"Bad local header for {member.name}")
+            name_len, extra_len = struct.unpack('<HH', header[26:30])
+            stream.read(name_len + extra_len)
+            # Sizes come from the central directory (local headers may defer them to a data descriptor)
+            extract_member(member, stream.iter_read(member.compressed_size), dest)
+    return len(span)
+
+def stream_unzip(url: str, dest: str | Path, *, workers: int = 8, span_size: int = SPAN_SIZE,
+                 headers: dict = None, log: bool = False) -> bool:
+    """
+    Install a remote zip into dest without saving the archive
+
+    Fetches the central directory with range requests, groups members into
+    contiguous spans and downloads the spans in parallel, extracting each
+    member while its bytes arrive (CRC checked, modes/symlinks kept).
+    Raises on failure (e.g. the server doesn't support ranges).
+    """
+    dest = Path(dest).resolve()
+    headers = {**USER_AGENT, **(headers or {})}
+    session = _session(headers)
+
+    head = session.head(url, allow_redirects=True, timeout=30)
+    head.raise_for_status()
+    url = head.url  # Resolve redirects (e.g. HF -> CDN) once
+    size = int(head.headers.get('Content-Length') or 0)
+    if not size or head.headers.get('Accept-Ranges', '').lower() != 'bytes':
+        raise IOError('Server does not support range requests')
+
+    tail_offset = max(0, size - TAIL_SIZE)
+    tail = _fetch_bytes(url, tail_offset, size, headers)
+    cd_offset, cd_size, count = _parse_eocd(tail, tail_offset)
+    if cd_offset >= tail_offset:
+        cd = tail[cd_offset - tail_offset:cd_offset - tail_offset + cd_size]
+    else:
+        cd = _fetch_bytes(url, cd_offset, cd_offset + cd_size, headers)
+
+    members = parse_central_directory(cd, cd_offset)
+    if len(members) != count:
+        raise zipfile.BadZipFile(f"Central directory lists {len(members)} of {count} members")
+    other = {m.method for m in members if not m.is_dir and m.method not in RAW_METHODS}
+    if other:   # Checked before writing anything; install_zip falls back to download + extract_zip
+        raise zipfile.BadZipFile(f"Compression method(s) {sorted(other)} can't be streamed")
+
+    spans = plan_spans(members, span_size)
+    if log:
+        print(f">> Streaming {count} files ({size / 1024**2:.1f} MiB) in {len(spans)} spans -> {dest}")
+
+    dest.mkdir(parents=True, exist_ok=True)
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_extract_span, url, group, dest, headers) for group in spans]
+        for future in futures:
+            future.result()
+
+    if log:
+        print(f">> Streamed and unpacked in {time.time() - start:.1f}s")
+    return True
+
+
+# ======================= ZIP FILES ========================
+
+def _member_from_info(info: zipfile.ZipInfo) -> ZipMember:
+    mode = (info.external_attr >> 16) if info.create_system == 3 else 0
+    return ZipMember(info.filename, info.compress_type, info.CRC, info.compress_size,
+                     info.file_size, info.header_offset, mode, info.date_time)
+
+def _file_crc(path: Path) -> int:
+    crc = 0
+    with open(path, 'rb') as f:
+        while chunk := f.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+def is_current(member: ZipMember, dest: Path) -> bool:
+    """True if member is already on disk with the same size and CRC"""
+    target = safe_target(dest, member.name)
+    if member.is_dir:
+        return target.is_dir()
+    if member.is_symlink:
+        return target.is_symlink() and zlib.crc32(os.readlink(target).encode()) == member.crc
+    try:
+        st = target.lstat()
+    except OSError:
+        return False
+    return stat.S_ISREG(st.st_mode) and st.st_size == member.file_size and _file_crc(target) == member.crc
+
+def _extract_local(zip_path: str, members: list[ZipMember], dest: str) -> tuple[int, int]:
+    """Worker: extract members straight from the archive's raw bytes, returns (written, skipped)"""
+    dest, written, skipped = Path(dest), 0, 0
+    archive = None
+    with open(zip_path, 'rb') as f:
+        for member in members:
+            if is_current(member, dest):
+                skipped += 1
+                continue
+            if member.method not in RAW_METHODS:     # bzip2, lzma, ... via zipfile
+                archive = archive or zipfile.ZipFile(zip_path)
+                with archive.open(member.name) as source:
+                    extract_member(member, iter(lambda: source.read(CHUNK_SIZE), b''), dest, decompressed=True)
+                written += 1
+                continue
+            f.seek(member.offset)
+            header = f.read(30)
+            if header[:4] != b'PK\x03\x04':
+                raise zipfile.BadZipFile(f"Bad local header for {member.name}")
+            name_len, extra_len = struct.unpack('<HH', header[26:30])
+            f.seek(name_len + extra_len, os.SEEK_CUR)
+            stream = _ByteStream(iter(lambda: f.read(CHUNK_SIZE), b''), 0)
+            extract_member(member, stream.iter_read(member.compressed_size), dest)
+            written += 1
+    if archive:
+        archive.close()
+    return written, skipped
+
+def partition_members(members: list[ZipMember], parts: int) -> list[list[ZipMember]]:
+    """Split members into parts with balanced compressed bytes (largest first, least loaded bucket)"""
+    buckets = [(0, i, []) for i in range(parts)]
+    for member in sorted(members, key=lambda m: m.compressed_size, reverse=True):
+        load, i, bucket = heapq.heappop(buckets)
+        bucket.append(member)
+        heapq.heappush(buckets, (load + member.compressed_size + 1, i, bucket))
+    # Archive order inside a bucket keeps reads mostly sequential
+    return [sorted(bucket, key=lambda m: m.offset) for _, _, bucket in buckets if bucket]
+
+def _pool_context():
+    """
+    Start method for the extraction pool
+
+    fork is unsafe in the multithreaded Jupyter kernel (downloading-ru runs
+    inside it), so forkserver is used there. Plain scripts keep fork: spawn
+    and forkserver re-import __main__ in every worker, which would re-run
+    unguarded scripts like downloading-en.py.
+    """
+    main = sys.modules.get('__main__')
+    if 'ipykernel' in sys.modules or not getattr(main, '__file__', None):
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('fork')
+
+def extract_zip(zip_path: str | Path, dest: str | Path, *, workers: Optional[int] = None, log: bool = False) -> int:
+    """
+    Extract a local zip into dest (modes, mtimes and symlinks kept), returns written member count
+
+    Members are partitioned across a process pool (inflate is CPU bound) and
+    written directly to their final paths. Members whose size and CRC already
+    match on disk are skipped, so re-extracting an unchanged archive is cheap.
+    """
+    zip_path, dest = str(zip_path), Path(dest).resolve()
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [_member_from_info(info) for info in archive.infolist()]
+
+    dest.mkdir(parents=True, exist_ok=True)
+    for member in members:
+        if member.is_dir:
+            safe_target(dest, member.name).mkdir(parents=True, exist_ok=True)
+    files = [m for m in members if not m.is_dir]
+
+    workers = workers or os.cpu_count() or 1
+    total = sum(m.compressed_size for m in files)
+    start = time.time()
+    with span('extract_zip', cat='archive', archive=Path(zip_path).name) as trace:
+        if workers == 1 or len(files) < 2 or total < PARALLEL_MIN_SIZE:
+            written, skipped = _extract_local(zip_path, files, str(dest))
+        else:
+            parts = partition_members(files, workers)
+            with ProcessPoolExecutor(max_workers=len(parts), mp_context=_pool_context()) as pool:
+                results = list(pool.map(_extract_local, [zip_path] * len(parts), parts, [str(dest)] * len(parts)))
+            written, skipped = map(sum, zip(*results))
+        trace.update(written=written, skipped=skipped)
+
+    if log:
+        print(f">> Extracted {written} files ({skipped} unchanged) from {Path(zip_path).name} in {time.time() - start:.1f}s")
+    return written
+
+def install_zip(url: str, dest: str | Path, *, zip_path: str | Path = None,
+                download: Callable[[str, str], bool] = None, log: bool = False) -> bool:
+    """
+    Install a remote zip into dest, streaming it if possible
+
+    Falls back to downloading the archive to zip_path (with `download(url, path)`,
+    e.g. Manager.download_url_to_path, or plain requests), extracting it and
+    removing the archive.
+    """
+    try:
+        with span('stream_unzip', cat='archive', url=url):
+            return stream_unzip(url, dest, log=log)
+    except Exception as e:
+        if log:
+            print(f">> Streaming install unavailable ({e}), falling back to download + unzip")
+
+    zip_path = Path(zip_path or Path(dest).with_suffix('.zip'))
+    try:
+        with span('download_zip', cat='archive', url=url):
+            if download:
+                if not download(url, str(zip_path)):
+                    return False
+            else:
+                with requests.get(url, headers=USER_AGENT, stream=True, timeout=60) as response:
+                    response.raise_for_status()
+                    with open(zip_path, 'wb') as f:
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            f.write(chunk)
+        extract_zip(zip_path, dest, log=log)
+        return True
+    except Exception as e:
+        print(f">> Failed to install {url}: {e}")
+        return False
+    finally:
+        zip_path.unlink(missing_ok=True)
@@ -0,0 +1,108 @@
+""" Config Utilities Module | by ANXETY """
+
+from functools import lru_cache
+from typing import Optional
+from pathlib import Path
+import argparse
+import hashlib
+import json
+import re
+
+
+REPO_ROOT = Path(__file__).parent.parent
+CONFIGS_DIR = REPO_ROOT / '__configs__'
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_FORK = 'anxety-solo/sd-webui'
+
+
+# ======================== MANIFEST ========================
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _git_dir(repo_root: Path) -> Path:
+    git = repo_root / '.git'
+    if git.is_file():   # Worktree / submodule: "gitdir: <path>"
+        git = (repo_root / git.read_text().split(':', 1)[1].strip()).resolve()
+    return git
+
+def checkout_branch(repo_root: Path = REPO_ROOT) -> Optional[str]:
+    """Branch of the local checkout from .git/HEAD (None if detached or not a git checkout)"""
+    try:
+        head = (_git_dir(repo_root) / 'HEAD').read_text().strip()
+    except (OSError, IndexError):
+        return None
+    prefix = 'ref: refs/heads/'
+    return head[len(prefix):] if head.startswith(prefix) else None
+
+def checkout_fork(repo_root: Path = REPO_ROOT) -> Optional[str]:
+    """'owner/repo' of the checkout's GitHub origin remote (None if there is none)"""
+    try:
+        config = (_git_dir(repo_root) / 'config').read_text()
+    except (OSError, IndexError):
+        return None
+    origin = re.search(r'\[remote "origin"\]([^\[]*)', config)
+    url = re.search(r'url\s*=\s*\S*github\.com[:/]([\w.-]+/[\w.-]+?)(?:\.git)?/?\s*$', origin[1], re.M) if origin else None
+    return url[1] if url else None
+
+def build_manifest(configs_dir: Path = CONFIGS_DIR, branch: Optional[str] = None, fork: Optional[str] = None) -> dict:
+    """Hash every file under configs_dir and write manifest.json (run after changing __configs__)"""
+    files = {
+        path.relative_to(configs_dir).as_posix(): file_sha256(path)
+        for path in sorted(configs_dir.rglob('*'))
+        if path.is_file() and path.name != MANIFEST_NAME
+    }
+    manifest = {
+        'fork': fork or checkout_fork() or DEFAULT_FORK,
+        'branch': branch or checkout_branch() or 'main',
+        'files': files
+    }
+    (configs_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + '\n')
+    load_manifest.cache_clear()
+    return manifest
+
+@lru_cache(maxsize=None)
+def load_manifest(configs_dir: Path = CONFIGS_DIR) -> Optional[dict]:
+    try:
+        return json.loads((configs_dir / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+# ======================== RESOLVE =========================
+
+def local_config(source: str, fork: str, branch: str, configs_dir: Path = CONFIGS_DIR) -> Optional[Path]:
+    """
+    Local path of __configs__/<source> if it can stand in for the network copy
+
+    The manifest must record the requested fork and branch (the branch of the
+    working copy is not consulted: checkouts are often on another local name),
+    and the file must be listed with a matching sha256; otherwise None
+    (download it from the fork).
+    """
+    manifest = load_manifest(configs_dir)
+    if (manifest is None or manifest.get('branch') != branch
+            or (manifest.get('fork') or '').lower() != fork.lower()):
+        return None
+
+    expected = manifest['files'].get(source)
+    path = configs_dir / source
+    if expected is None or not path.is_file() or file_sha256(path) != expected:
+        return None
+    return path
+
+
+# ========================== CLI ===========================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Regenerate __configs__/manifest.json')
+    parser.add_argument('--branch', help='Branch to record (default: current checkout branch)')
+    parser.add_argument('--fork', help=f"Fork to record (default: GitHub origin remote, else {DEFAULT_FORK})")
+    args = parser.parse_args()
+
+    manifest = build_manifest(branch=args.branch, fork=args.fork)
+    print(f">> {len(manifest['files'])} files hashed for {manifest['fork']}@{manifest['branch']} -> {CONFIGS_DIR / MANIFEST_NAME}")
@@ -0,0 +1,395 @@
+""" Git Utilities Module | by ANXETY """
+
+from modules.trace_utils import span      # Install tracing
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+from pathlib import Path
+import hashlib
+import asyncio
+import shutil
+import fcntl
+import re
+import time
+import sys
+import os
+
+
+CLONE_JOBS = int(os.environ.get('ANXLIGHT_CLONE_JOBS', 8))     # Concurrent clones
+CLONE_RETRIES = 2                                               # Extra attempts on transient errors
+CLONE_TIMEOUT = 600                                             # Seconds per attempt
+FETCH_TIMEOUT = 180                                             # Seconds per fetch when updating
+
+# stderr fragments that mean "try again" (network / server hiccups, not a bad repo)
+TRANSIENT_ERRORS = (
+    'could not resolve host', 'connection reset', 'connection timed out', 'timed out',
+    'early eof', 'rpc failed', 'the remote end hung up', 'unable to access',
+    'http 5', 'error: 5', 'failed to connect', 'temporary failure'
+)
+
+GIT_ENV = {**os.environ, 'GIT_TERMINAL_PROMPT': '0'}
+
+# Persistent bare mirrors: warm clones become local copies, updates fetch deltas only
+HOME = Path(os.environ.get('home_path', os.environ.get('HOME', '/content')))
+MIRROR_DIR = Path(os.environ.get('ANXLIGHT_GIT_CACHE', HOME / '.cache' / 'anxlight' / 'git-mirrors'))
+USE_MIRRORS = os.environ.get('ANXLIGHT_GIT_MIRRORS', '1') != '0'
+
+
+@dataclass(slots=True)
+class CloneResult:
+    """Outcome of one repo clone"""
+    name: str
+    url: str
+    path: Path
+    ok: bool = False
+    skipped: bool = False
+    mirrored: bool = False
+    attempts: int = 0
+    elapsed: float = 0.0
+    error: str = ''
+
+
+@dataclass(slots=True)
+class UpdateResult:
+    """Outcome of one repo update (old/new are short HEAD shas)"""
+    name: str
+    path: Path
+    ok: bool = False
+    changed: bool = False
+    old: str = ''
+    new: str = ''
+    commits: int = 0
+    elapsed: float = 0.0
+    error: str = ''
+    note: str = ''      # Informational outcome of a successful update (e.g. ahead of upstream)
+
+
+def parse_repo_spec(spec: str) -> tuple[str, str]:
+    """'url [name]' -> (url, name); name defaults to the repo name without .git"""
+    parts = spec.split()
+    url = parts[0]
+    name = parts[1] if len(parts) > 1 else url.rstrip('/').split('/')[-1].removesuffix('.git')
+    return url, name
+
+def error_line(stderr: str) -> str:
+    """First 'fatal:'/'error:' line of git stderr (or its last line)"""
+    lines = stderr.splitlines()
+    return next((l for l in lines if l.startswith(('fatal:', 'error:'))), lines[-1] if lines else '')
+
+def is_transient(stderr: str) -> bool:
+    stderr = stderr.lower()
+    return any(fragment in stderr for fragment in TRANSIENT_ERRORS)
+
+
+async def run_git(*args: str, cwd: Optional[Path] = None, timeout: float = CLONE_TIMEOUT) -> tuple[int, str]:
+    """Run git with args, returns (returncode, stderr); kills it on timeout"""
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=cwd, env=GIT_ENV,
+        stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return -1, f"timed out after {timeout}s"
+    return process.returncode, stderr.decode(errors='replace').strip()
+
+async def git_output(*args: str, cwd: Optional[Path] = None, timeout: float = 60) -> Optional[str]:
+    """stdout of a quick local git command, None if it failed"""
+    process = await asyncio.create_subprocess_exec(
+        'git', *args, cwd=cwd, env=GIT_ENV,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    return stdout.decode(errors='replace').strip() if process.returncode == 0 else None
+
+def mirror_path(url: str) -> Path:
+    """Cache path of the bare mirror for url (readable name + url hash)"""
+    name = re.sub(r'[^\w.-]', '_', url.rstrip('/').split('/')[-1].removesuffix('.git'))
+    return MIRROR_DIR / f"{name}-{hashlib.sha1(url.encode()).hexdigest()[:10]}.git"
+
+class _MirrorLock:
+    """Exclusive flock on a mirror (serialises tasks and processes updating the same mirror)"""
+
+    def __init__(self, mirror: Path):
+        self.path = mirror.with_suffix('.lock')
+
+    async def __aenter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.fd = os.open(self.path, os.O_CREAT | os.O_RDWR)
+        await asyncio.to_thread(fcntl.flock, self.fd, fcntl.LOCK_EX)
+        return self
+
+    async def __aexit__(self, *exc):
+        fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+
+async def _configure_mirror(mirror: Path, shallow: bool) -> None:
+    """
+    Limit what the mirror fetches to branches (plus tags when it holds full history)
+
+    GitHub advertises every refs/pull/* head, which `clone --mirror` would
+    download and refresh. A shallow mirror tracks only its default branch,
+    like the `clone --depth 1` it replaces.
+    """
+    branch = await git_output('symbolic-ref', '--short', 'HEAD', cwd=mirror) if shallow else None
+    specs = [f"+refs/heads/{branch}:refs/heads/{branch}"] if branch else ['+refs/heads/*:refs/heads/*']
+    if not shallow:
+        specs.append('+refs/tags/*:refs/tags/*')
+    await run_git('config', '--unset-all', 'remote.origin.fetch', cwd=mirror)
+    await run_git('config', '--unset-all', 'remote.origin.mirror', cwd=mirror)     # Mirrors made by older versions
+    for spec in specs:
+        await run_git('config', '--add', 'remote.origin.fetch', spec, cwd=mirror)
+
+async def _refresh_mirror(url: str, mirror: Path, depth: Optional[int]) -> tuple[bool, str]:
+    """
+    Create or refresh the bare mirror of url (caller holds its lock)
+
+    A new mirror is a bare clone (shallow if depth is set); an existing one
+    only fetches new objects of its branches, and a shallow one is deepened
+    when a full clone is requested. A failed refresh keeps the stale mirror
+    usable.
+    """
+    if not (mirror / 'HEAD').exists():
+        shutil.rmtree(mirror, ignore_errors=True)
+        code, stderr = await run_git('clone', '--bare', *(['--depth', str(depth)] if depth else []), url, str(mirror))
+        if code != 0:
+            shutil.rmtree(mirror, ignore_errors=True)
+            return False, stderr
+        await _configure_mirror(mirror, shallow=bool(depth))
+        return True, ''
+
+    shallow = (mirror / 'shallow').exists()
+    await _configure_mirror(mirror, shallow=shallow and bool(depth))
+    args = ['fetch', '--prune', 'origin']
+    if shallow:
+        args += ['--unshallow'] if not depth else ['--depth', str(depth)]
+    code, stderr = await run_git(*args, cwd=mirror)
+    if code != 0:
+        print(f"Mirror refresh failed for {url} ({error_line(stderr)}), using cached copy.", file=sys.stderr)
+    return True, ''
+
+async def clone_from_mirror(url: str, path: Path, depth: Optional[int] = 1) -> tuple[bool, str]:
+    """Clone path from the local mirror of url (hardlinked objects), then point origin back at url"""
+    mirror = mirror_path(url)
+    async with _MirrorLock(mirror):
+        ready, stderr = await _refresh_mirror(url, mirror, depth)
+        if not ready:
+            return False, stderr
+        code, stderr = await run_git('clone', '--local', str(mirror), str(path))
+    if code == 0:
+        code, stderr = await run_git('remote', 'set-url', 'origin', url, cwd=path)
+    if code != 0:
+        shutil.rmtree(path, ignore_errors=True)
+    return code == 0, stderr
+
+async def clone_repo(url: str, path: Path, *, depth: Optional[int] = 1, retries: int = CLONE_RETRIES,
+                     semaphore: Optional[asyncio.Semaphore] = None, mirror: bool = USE_MIRRORS) -> CloneResult:
+    """Clone url into path (from the mirror cache when enabled), retrying transient failures with backoff"""
+    result = CloneResult(path.name, url, path)
+    if path.exists():
+        result.ok = result.skipped = True
+        return result
+
+    async with semaphore or asyncio.Semaphore(1):
+        with span(f"clone {path.name}", cat='git', url=url) as trace:
+            start = time.perf_counter()
+            await _clone(result, depth, retries, mirror)
+            result.elapsed = time.perf_counter() - start
+            trace.update(ok=result.ok, mirrored=result.mirrored, attempts=result.attempts)
+    return result
+
+async def _clone(result: CloneResult, depth: Optional[int], retries: int, mirror: bool) -> None:
+    url, path = result.url, result.path
+    if mirror:
+        result.mirrored, error = await clone_from_mirror(url, path, depth)
+        if result.mirrored:
+            result.ok, result.attempts = True, 1
+            return
+        print(f"Mirror cache unavailable for '{path.name}' ({error_line(error)}), cloning directly.", file=sys.stderr)
+
+    args = ['clone', *(['--depth', str(depth)] if depth else []), url, str(path)]
+    for attempt in range(retries + 1):
+        result.attempts = attempt + 1
+        code, stderr = await run_git(*args)
+        if code == 0:
+            result.ok, result.error = True, ''
+            return
+
+        result.error = error_line(stderr) or f"exit code {code}"
+        shutil.rmtree(path, ignore_errors=True)     # Drop partial clone before retrying
+        if attempt == retries or not is_transient(stderr):
+            return
+        await asyncio.sleep(2 ** attempt)
+
+async def clone_repos(specs: Iterable[str], dest: str | Path, *, jobs: int = CLONE_JOBS, depth: Optional[int] = 1,
+                      retries: int = CLONE_RETRIES, mirror: bool = USE_MIRRORS,
+                      tag: str = 'git_utils', log: bool = True) -> list[CloneResult]:
+    """
+    Clone 'url [name]' specs into dest concurrently (at most jobs at a time)
+
+    Existing targets are skipped. Returns a CloneResult per spec with timing
+    and the git error line for failures.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(max(1, jobs))
+
+    repos = [parse_repo_spec(spec) for spec in specs]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        clone_repo(url, dest / name, depth=depth, retries=retries, semaphore=semaphore, mirror=mirror)
+        for url, name in repos
+    ))
+
+    if log:
+        report_clones(results, tag, time.perf_counter() - start)
+    return list(results)
+
+def report_clones(results: list[CloneResult], tag: str, elapsed: float) -> None:
+    for r in results:
+        if r.skipped:
+            print(f"Extension '{r.name}' already exists. Skipping clone.")
+        elif r.ok:
+            retried = f", {r.attempts} attempts" if r.attempts > 1 else ''
+            source = ' (mirror cache)' if r.mirrored else ''
+            print(f"--- [{tag}] Cloned '{r.name}'{source} in {r.elapsed:.1f}s{retried} ---")
+        else:
+            print(f"Error cloning '{r.name}' from {r.url} after {r.attempts} attempt(s): {r.error}", file=sys.stderr)
+
+    cloned = sum(r.ok and not r.skipped for r in results)
+    failed = sum(not r.ok for r in results)
+    print(f"--- [{tag}] {cloned} cloned, {failed} failed in {elapsed:.1f}s ---")
+
+
+# ========================= UPDATE =========================
+
+def is_repo(path: Path) -> bool:
+    return (Path(path) / '.git').exists()
+
+def find_repos(root: str | Path) -> list[Path]:
+    """Git checkouts directly under root (e.g. WEBUI/extensions)"""
+    root = Path(root)
+    return sorted(p for p in root.iterdir() if p.is_dir() and is_repo(p)) if root.is_dir() else []
+
+async def _fetch(path: Path, retries: int) -> tuple[int, str]:
+    for attempt in range(retries + 1):
+        code, stderr = await run_git('fetch', '--quiet', '--prune', cwd=path, timeout=FETCH_TIMEOUT)
+        if code == 0 or attempt == retries or not is_transient(stderr):
+            return code, stderr
+        await asyncio.sleep(2 ** attempt)
+
+async def _fast_forward(path: Path, keep_local: bool) -> tuple[bool, str]:
+    """
+    Move HEAD to its upstream
+
+    keep_local (the WebUI): local changes are stashed and popped back, a
+    diverged branch is rebased like `pull --rebase`. Otherwise (extensions)
+    local edits are discarded as before, but local commits are never thrown
+    away: a diverged checkout is left alone and reported. Callers handle the
+    ahead-only case (upstream already in HEAD) before getting here.
+    """
+    ancestor, _ = await run_git('merge-base', '--is-ancestor', 'HEAD', '@{u}', cwd=path)
+    if ancestor != 0 and not keep_local:
+        return False, 'diverged from upstream, left as is'
+
+    stashed = False
+    if keep_local:
+        stashed = bool(await git_output('status', '--porcelain', cwd=path))
+        if stashed:
+            code, stderr = await run_git('stash', 'push', '--include-untracked', cwd=path)
+            if code != 0:
+                return False, error_line(stderr)
+    else:
+        await run_git('reset', '--hard', '--quiet', cwd=path)
+
+    if ancestor == 0:
+        code, stderr = await run_git('merge', '--ff-only', '--quiet', '@{u}', cwd=path)
+    else:
+        code, stderr = await run_git('rebase', '--quiet', '@{u}', cwd=path)
+        if code != 0:
+            await run_git('rebase', '--abort', cwd=path)
+
+    if stashed:
+        pop_code, pop_stderr = await run_git('stash', 'pop', cwd=path)
+        if pop_code != 0 and code == 0:
+            return False, f"updated, but local changes did not re-apply (kept in stash): {error_line(pop_stderr)}"
+    return code == 0, error_line(stderr)
+
+async def update_repo(path: Path, *, keep_local: bool = False, retries: int = CLONE_RETRIES,
+                      semaphore: Optional[asyncio.Semaphore] = None) -> UpdateResult:
+    """Fetch path's upstream and fast-forward only if the remote head moved"""
+    result = UpdateResult(path.name, path)
+    if not is_repo(path):
+        result.error = 'not a git repository'
+        return result
+
+    start = time.perf_counter()
+    with span(f"update {path.name}", cat='git') as trace:
+        # Only the network round-trip is throttled; the local fast-forward is cheap
+        async with semaphore or asyncio.Semaphore(1):
+            code, stderr = await _fetch(path, retries)
+
+        heads = await git_output('rev-parse', 'HEAD', '@{u}', cwd=path)
+        if code != 0 or heads is None:
+            result.error = error_line(stderr) if code != 0 else 'no upstream branch (detached HEAD?)'
+        else:
+            head, upstream = heads.split()
+            result.old = result.new = head[:7]
+            if upstream == head:
+                result.ok = True
+            elif (await run_git('merge-base', '--is-ancestor', upstream, head, cwd=path))[0] == 0:
+                result.ok = True    # Only local commits on top of upstream: nothing to pull
+                result.note = 'ahead of upstream, nothing to do'
+            else:
+                count = await git_output('rev-list', '--count', 'HEAD..@{u}', cwd=path)
+                result.commits = int(count or 0)
+                result.ok, result.error = await _fast_forward(path, keep_local)
+                result.new = (await git_output('rev-parse', 'HEAD', cwd=path) or head)[:7]
+                result.changed = result.new != result.old
+        result.elapsed = time.perf_counter() - start
+        trace.update(ok=result.ok, changed=result.changed, commits=result.commits)
+    return result
+
+async def update_repos(paths: Iterable[str | Path], *, keep_local: Iterable[str | Path] = (), jobs: int = CLONE_JOBS,
+                       retries: int = CLONE_RETRIES, tag: str = 'git_utils', log: bool = True) -> list[UpdateResult]:
+    """
+    Update many checkouts in one wave: parallel fetches (at most jobs at a
+    time), then a fast-forward for just the repos whose upstream moved
+
+    Paths listed in keep_local keep their local changes (stash / rebase);
+    see _fast_forward. Unchanged repos are not touched at all.
+    """
+    semaphore = asyncio.Semaphore(max(1, jobs))
+    keep = {Path(p).resolve() for p in keep_local}
+    paths = [Path(p) for p in paths]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        update_repo(path, keep_local=path.resolve() in keep, retries=retries, semaphore=semaphore)
+        for path in paths
+    ))
+
+    if log:
+        report_updates(results, tag, time.perf_counter() - start)
+    return list(results)
+
+def report_updates(results: list[UpdateResult], tag: str, elapsed: float) -> None:
+    for r in results:
+        if r.changed:
+            print(f"--- [{tag}] Updated '{r.name}' {r.old}..{r.new} (+{r.commits} commit{'s' * (r.commits != 1)}) ---")
+        elif r.note:
+            print(f"--- [{tag}] '{r.name}': {r.note} ---")
+        if not r.ok:
+            print(f"Error updating '{r.name}': {r.error}", file=sys.stderr)
+
+    updated = sum(r.changed for r in results)
+    current = sum(r.ok and not r.changed for r in results)
+    failed = sum(not r.ok for r in results)
+    print(f"--- [{tag}] {updated} updated, {current} up to date, {failed} failed in {elapsed:.1f}s ---")
@@ -1,9 +1,21 @@
 """ JSON Utilities Module | by ANXETY """
 
+from typing import Callable
 from functools import wraps
 from pathlib import Path
+import ctypes.util
+import threading
+import hashlib
 import logging
+import marshal
+import atexit
+import ctypes
+import select
+import fcntl
+import struct
 import json
+import time
+import sys
 import os
 
 
@@ -110,37 +122,492 @@ def _set_nested_value(data: dict, keys: list, value: any):
         current = current[key]
     current[keys[-1]] = value
 
-def _read_json(filepath: str | Path) -> dict:
+def _file_signature(filepath: str | Path) -> tuple | None:
+    """Return (mtime_ns, size, inode) of file or None if missing"""
+    try:
+        st = os.stat(filepath)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+    except OSError:
+        return None
+
+def _content_digest(content: bytes) -> bytes:
+    return hashlib.blake2b(content, digest_size=16).digest()
+
+def _trusted(signature: tuple, stamp_ns: int) -> bool:
+    """
+    Check if a signature match alone proves the content is unchanged
+
+    mtime has coarse ticks, so a same-size rewrite within one tick keeps the
+    signature. Entries taken less than RACY_WINDOW_NS after the file's mtime
+    are "racy" (as in git's index) and must be confirmed by content hash.
     """
-    Safely read JSON file, returning empty dict on error/missing file
+    return signature[0] + RACY_WINDOW_NS <= stamp_ns
+
+def _encode_sections(data: dict) -> dict:
+    """Marshal every top-level value separately (columnar layout)"""
+    return {key: marshal.dumps(value) for key, value in data.items()}
+
+def _parse_sections(content: bytes) -> dict:
+    data = json.loads(content) if content.strip() else {}
+    if not isinstance(data, dict):
+        raise ValueError('Top-level JSON value must be an object')
+    return _encode_sections(data)
+
+def _load_sections(filepath: str | Path) -> dict:
+    """
+    Return top-level sections of JSON file as marshalled blobs
+
+    Lookup order: in-process cache -> snapshot sidecar -> JSON parse.
+    Entries are validated by file signature, plus a content hash while the
+    signature is racy (see _trusted), so the JSON file always stays the
+    source of truth. Reading never writes the sidecar.
 
     Args:
         filepath: Path to JSON file (str or Path object)
     """
-    try:
-        if not os.path.exists(filepath):
-            return {}
+    stamp = time.time_ns()      # Taken before stat: a later rewrite can't look older than the entry
+    signature = _file_signature(filepath)
+    if signature is None:
+        return {}
+
+    cache_key = os.path.abspath(filepath)
+    cached = _cache.get(cache_key)
+    if cached and cached[0] == signature and _trusted(signature, cached[2]):
+        return cached[3]
+
+    snapshot = None
+    if not cached:
+        snapshot_path = _snapshot_path(filepath)
+        snapshot = _load_snapshot(snapshot_path) if snapshot_path.exists() else None
+        if snapshot and snapshot[0] == signature and _trusted(signature, snapshot[2]):
+            _cache[cache_key] = (signature, snapshot[1], snapshot[2], snapshot[3])
+            return snapshot[3]
+
+    with open(filepath, 'rb') as f:
+        content = f.read()
+    digest = _content_digest(content)
+
+    if cached and cached[1] == digest:
+        sections = cached[3]
+    elif snapshot and snapshot[1] == digest:
+        sections = snapshot[3]
+    else:
+        sections = _parse_sections(content)
+
+    _cache[cache_key] = (signature, digest, stamp, sections)
+    return sections
 
-        with open(filepath, 'r') as f:
-            content = f.read()
-            return json.loads(content) if content.strip() else {}
+def _read_disk(filepath: str | Path) -> dict:
+    """
+    Safely read JSON file from disk, returning empty dict on error/missing file
+
+    Args:
+        filepath: Path to JSON file (str or Path object)
+    """
+    try:
+        sections = _load_sections(filepath)
+        return {key: marshal.loads(blob) for key, blob in sections.items()}
     except Exception as e:
         logger.error(f"Read error ({filepath}): {str(e)}")
         return {}
 
-def _write_json(filepath: str | Path, data: dict):
+def _read_json(filepath: str | Path) -> dict:
+    """
+    Read JSON document, including changes still pending in write-behind mode
+
+    Args:
+        filepath: Path to JSON file (str or Path object)
+    """
+    pending = _pending_for(filepath)
+    if pending:
+        return pending.read()
+    return _read_disk(filepath)
+
+def _read_section(filepath: str | Path, key: str) -> any:
+    """
+    Read single top-level value without decoding the rest of the document
+
+    Args:
+        filepath: Path to JSON file (str or Path object)
+        key: Top-level key
+    """
+    pending = _pending_for(filepath)
+    if pending:
+        return pending.read().get(key)
+
+    try:
+        blob = _load_sections(filepath).get(key)
+        return marshal.loads(blob) if blob is not None else None
+    except Exception as e:
+        logger.error(f"Read error ({filepath}): {str(e)}")
+        return None
+
+def _write_disk(filepath: str | Path, data: dict) -> bool:
     """
-    Write JSON file with directory creation and error handling
+    Atomically write JSON file (temp file + rename) with directory creation
 
     Args:
         filepath: Destination path (str or Path object)
+
+    Returns:
+        True if file was written
     """
+    tmp_path = f"{filepath}.{os.getpid()}.tmp"
     try:
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        content = json.dumps(data, indent=4, ensure_ascii=False).encode('utf-8')
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        stamp = time.time_ns()
+        os.replace(tmp_path, filepath)
+
+        signature = _file_signature(filepath)
+        digest = _content_digest(content)
+        sections = _encode_sections(data)
+        _cache[os.path.abspath(filepath)] = (signature, digest, stamp, sections)
+
+        snapshot_path = _snapshot_path(filepath)
+        if snapshot_path.exists():
+            _write_snapshot(snapshot_path, signature, digest, stamp, sections)
+        return True
     except Exception as e:
         logger.error(f"Write error ({filepath}): {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+def _write_json(filepath: str | Path, data: dict):
+    """
+    Write JSON document, deferring to the pending buffer in write-behind mode
+
+    Args:
+        filepath: Destination path (str or Path object)
+    """
+    pending = _pending_for(filepath)
+    if pending:
+        pending.record(data)
+    else:
+        _write_disk(filepath, data)
+
+
+# ==================== Snapshot Sidecar ====================
+
+SNAPSHOT_SUFFIX = '.snapshot'
+_SNAPSHOT_TAG = ('ANXS', 2, marshal.version, sys.version_info[:2])
+RACY_WINDOW_NS = 2_000_000_000      # Generous mtime granularity (FAT/overlay ticks up to 2s)
+
+_cache = {}
+
+def _snapshot_path(filepath: str | Path) -> Path:
+    """Return sidecar snapshot path for JSON file"""
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + SNAPSHOT_SUFFIX)
+
+def _load_snapshot(snapshot_path: Path) -> tuple | None:
+    """
+    Load sidecar snapshot
+
+    Returns:
+        Tuple (signature, content hash, stamp, sections) or None if invalid/foreign
+    """
+    try:
+        with open(snapshot_path, 'rb') as f:
+            tag, *entry = marshal.loads(f.read())
+        if tag != _SNAPSHOT_TAG:
+            return None
+        return tuple(entry)
+    except Exception:
+        return None
+
+def _write_snapshot(snapshot_path: Path, signature: tuple, digest: bytes, stamp: int, sections: dict):
+    """Atomically replace sidecar snapshot"""
+    try:
+        tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(marshal.dumps((_SNAPSHOT_TAG, signature, digest, stamp, sections)))
+        os.replace(tmp_path, snapshot_path)
+    except Exception as e:
+        logger.warning(f"Snapshot write error ({snapshot_path}): {str(e)}")
+
+def enable_snapshot(filepath: str | Path):
+    """
+    Maintain a sidecar snapshot (marshal, one blob per top-level section)
+    next to JSON file. Every process reading the file afterwards loads the
+    snapshot instead of parsing JSON while the file is unchanged.
+
+    Args:
+        filepath: JSON file path
+    """
+    if not os.path.exists(filepath):
+        return
+
+    try:
+        sections = _load_sections(filepath)
+    except Exception as e:
+        logger.error(f"Read error ({filepath}): {str(e)}")
+        return
+    signature, digest, stamp, _ = _cache[os.path.abspath(filepath)]
+    snapshot = _load_snapshot(_snapshot_path(filepath))
+    if not snapshot or snapshot[:2] != (signature, digest):
+        _write_snapshot(_snapshot_path(filepath), signature, digest, stamp, sections)
+
+def disable_snapshot(filepath: str | Path):
+    """
+    Remove sidecar snapshot of JSON file
+
+    Args:
+        filepath: JSON file path
+    """
+    try:
+        _snapshot_path(filepath).unlink()
+    except FileNotFoundError:
+        pass
+
+
+# ================ Write-Behind (Coalescing) ================
+
+JOURNAL_SUFFIX = '.journal'
+
+_pending = {}
+_pending_lock = threading.Lock()
+_atexit_registered = False
+
+def _pending_for(filepath: str | Path):
+    """Return write-behind buffer of file or None if mode is off"""
+    if not _pending:
+        return None
+    return _pending.get(os.path.abspath(filepath))
+
+def _has_path(data: dict, keys: list) -> bool:
+    """Check if exact key path exists (also for None values)"""
+    current = data
+    for key in keys:
+        if not isinstance(current, dict) or key not in current:
+            return False
+        current = current[key]
+    return True
+
+def _delete_nested_value(data: dict, keys: list):
+    """Remove value at key path if present"""
+    parent = _get_nested_value(data, keys[:-1]) if len(keys) > 1 else data
+    if isinstance(parent, dict):
+        parent.pop(keys[-1], None)
+
+def _journal_paths(filepath: str) -> list[str]:
+    """Journals of filepath: '<file>.journal.<pid>' (and a legacy '<file>.journal')"""
+    directory, name = os.path.split(filepath)
+    prefix = name + JOURNAL_SUFFIX
+    try:
+        entries = os.listdir(directory or '.')
+    except OSError:
+        return []
+    return sorted(os.path.join(directory, e) for e in entries
+                  if e == prefix or (e.startswith(prefix + '.') and e[len(prefix) + 1:].isdigit()))
+
+def _replay_journal(filepath: str):
+    """
+    Apply journals left by processes that died before flushing
+
+    A live owner holds an exclusive flock on its journal for as long as the
+    file exists, so journals that are locked (or were removed/replaced while
+    we waited for the lock) are left alone.
+
+    Args:
+        filepath: JSON file path
+    """
+    for journal_path in _journal_paths(filepath):
+        try:
+            f = open(journal_path, 'r', encoding='utf-8')
+        except OSError:
+            continue
+        with f:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                if os.fstat(f.fileno()).st_ino != os.stat(journal_path).st_ino:
+                    continue
+            except OSError:
+                continue    # Owned by a live process / already flushed and removed
+
+            data, applied = _read_disk(filepath), 0
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break    # Torn last line of a crashed write
+                keys = parse_key(entry['k'])
+                if entry.get('d'):
+                    _delete_nested_value(data, keys)
+                else:
+                    _set_nested_value(data, keys, entry['v'])
+                applied += 1
+
+            if not applied or _write_disk(filepath, data):
+                os.remove(journal_path)
+            if applied:
+                logger.warning(f"Recovered {applied} unflushed change(s) for {filepath} from {journal_path}")
+
+
+class _PendingWrites:
+    """In-memory document with dirty key paths, flushed on a debounce timer
+
+    Every recorded change is appended to this process's journal before it is
+    acknowledged, so a crash between flushes loses nothing. Changes other
+    processes make to the file are picked up on the next access: the disk
+    document is re-read and only our dirty key paths are laid on top, which
+    is also exactly what a flush writes.
+    """
+
+    def __init__(self, filepath: str, delay: float, max_delay: float):
+        self.filepath = filepath
+        self.journal_path = f"{filepath}{JOURNAL_SUFFIX}.{os.getpid()}"
+        self.delay = delay
+        self.max_delay = max_delay
+        self.lock = threading.RLock()
+        self.data = None
+        self.base = None        # Disk sections self.data was built from
+        self.dirty = set()
+        self.first_dirty = None
+        self.timer = None
+        self.journal = None
+
+    def _apply_dirty(self, target: dict):
+        """Copy dirty key paths (values or deletions) from self.data onto target"""
+        for key in sorted(self.dirty, key=lambda k: len(parse_key(k))):
+            keys = parse_key(key)
+            if _has_path(self.data, keys):
+                _set_nested_value(target, keys, marshal.loads(marshal.dumps(_get_nested_value(self.data, keys))))
+            else:
+                _delete_nested_value(target, keys)
+
+    def document(self) -> dict:
+        """Pending document, rebased onto the disk version if the file changed since it was loaded"""
+        try:
+            sections = _load_sections(self.filepath)
+        except Exception as e:
+            logger.error(f"Read error ({self.filepath}): {str(e)}")
+            sections = self.base if self.base is not None else {}
+
+        if self.data is None or sections is not self.base:
+            disk = {key: marshal.loads(blob) for key, blob in sections.items()}
+            if self.data is not None:
+                self._apply_dirty(disk)
+            self.data, self.base = disk, sections
+        return self.data
+
+    def read(self) -> dict:
+        """Return private copy of the pending document"""
+        with self.lock:
+            return marshal.loads(marshal.dumps(self.document()))
+
+    def record(self, data: dict):
+        """Store new document state, journal changed key paths and schedule flush"""
+        with self.lock:
+            # Diff against what the caller read (not a fresh rebase) so foreign changes aren't taken as ours
+            changed = _diff_keys(self.data if self.data is not None else self.document(), data)
+            if not changed:
+                return
+
+            if self.journal is None:
+                self.journal = open(self.journal_path, 'a', encoding='utf-8')
+                fcntl.flock(self.journal.fileno(), fcntl.LOCK_EX)
+            for key in changed:
+                keys = parse_key(key)
+                if _has_path(data, keys):
+                    entry = {'k': key, 'v': _get_nested_value(data, keys)}
+                else:
+                    entry = {'k': key, 'd': True}
+                self.journal.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.journal.flush()
+
+            self.data = marshal.loads(marshal.dumps(data))
+            self.dirty.update(changed)
+            self._schedule()
+
+    def _schedule(self):
+        now = time.monotonic()
+        if self.first_dirty is None:
+            self.first_dirty = now
+        deadline = min(now + self.delay, self.first_dirty + self.max_delay)
+
+        if self.timer:
+            self.timer.cancel()
+        self.timer = threading.Timer(max(0.0, deadline - now), self.flush)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def flush(self) -> bool:
+        """Write the disk document with only the dirty key paths applied, then reset journal"""
+        with self.lock:
+            if self.timer:
+                self.timer.cancel()
+                self.timer = None
+            if not self.dirty:
+                return True
+            data = self.document()      # Rebase onto the current file first
+            if not _write_disk(self.filepath, data):
+                self._schedule()
+                return False
+
+            self.base = _cache[os.path.abspath(self.filepath)][3]
+            self.dirty.clear()
+            self.first_dirty = None
+            if self.journal:
+                # Remove while still locked: a replayer that opened it sees the inode vanish
+                if os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+                self.journal.close()
+                self.journal = None
+            return True
+
+
+def write_behind(filepath: str | Path, delay: float = 0.25, max_delay: float = 2.0):
+    """
+    Enable write-behind mode: save/update/delete_key only mark dirty key paths
+    and journal them; the file is written once per burst (debounce) or at exit
+
+    Args:
+        filepath: JSON file path
+        delay: Quiet time in seconds after the last change before flushing
+        max_delay: Upper bound in seconds between first change and flush
+    """
+    global _atexit_registered
+    path = os.path.abspath(filepath)
+    with _pending_lock:
+        if path in _pending:
+            return
+        _replay_journal(path)
+        _pending[path] = _PendingWrites(path, delay, max_delay)
+        if not _atexit_registered:
+            atexit.register(flush)
+            _atexit_registered = True
+
+def flush(filepath: str | Path = None) -> bool:
+    """
+    Write pending changes to disk now
+
+    Args:
+        filepath (optional): JSON file path; all write-behind files if omitted
+
+    Returns:
+        True if everything was written
+    """
+    if filepath is not None:
+        pending = _pending_for(filepath)
+        return pending.flush() if pending else True
+    return all([pending.flush() for pending in list(_pending.values())])
+
+def disable_write_behind(filepath: str | Path):
+    """
+    Flush pending changes and return file to direct (synchronous) writes
+
+    Args:
+        filepath: JSON file path
+    """
+    path = os.path.abspath(filepath)
+    with _pending_lock:
+        pending = _pending.get(path)
+        if pending and pending.flush():
+            del _pending[path]
 
 
 # ===================== Main Functions =====================
@@ -162,15 +629,15 @@ def read(*args) -> any:
     if len(args) > 1: key = args[1]
     if len(args) > 2: default = args[2]
 
-    data = _read_json(filepath)
     if key is None:
-        return data
+        return _read_json(filepath)
 
     keys = parse_key(key)
     if not keys:
         return default
 
-    result = _get_nested_value(data, keys)
+    section = _read_section(filepath, keys[0])
+    result = _get_nested_value(section, keys[1:])
     return result if result is not None else default
 
 @validate_args(3, 3)
@@ -268,13 +735,224 @@ def key_exists(*args) -> bool:
     filepath, key = args[0], args[1]
     value = args[2] if len(args) > 2 else None
 
-    data = _read_json(filepath)
     keys = parse_key(key)
     if not keys:
         return False
 
-    result = _get_nested_value(data, keys)
+    result = _get_nested_value(_read_section(filepath, keys[0]), keys[1:])
 
     if value is not None:
         return result == value
-    return result is not None
\ No newline at end of file
+    return result is not None
+
+
+# ================== Change Notifications ==================
+
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_DELETE = 0x200
+_IN_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+_IN_EVENT = struct.Struct('iIII')
+
+_watches = {}
+_watches_lock = threading.Lock()
+
+def _join_key(keys: list) -> str:
+    """
+    Build dot-separated key from segments, escaping dots (inverse of parse_key)
+
+    Args:
+        keys: List of key segments (e.g., ['parent.child', 'prop'])
+
+    Returns:
+        Dot-separated key string (e.g., 'parent..child.prop')
+    """
+    return '.'.join(str(k).replace('.', '..') for k in keys)
+
+def _diff_keys(old: any, new: any, prefix: list = None) -> list[str]:
+    """
+    Collect key paths whose values differ between two JSON documents
+
+    Args:
+        old: Previous value
+        new: Current value
+        prefix: Key path of the compared values
+
+    Returns:
+        List of dot-separated paths of changed leaves
+    """
+    prefix = prefix or []
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = []
+        for key in old.keys() | new.keys():
+            if key not in old or key not in new:
+                changed.append(_join_key(prefix + [key]))
+            elif old[key] != new[key]:
+                changed.extend(_diff_keys(old[key], new[key], prefix + [key]))
+        return changed
+    return [_join_key(prefix)] if old != new else []
+
+def _key_related(key: str, changed: str) -> bool:
+    """Check if changed path is the subscribed key, its parent or its child"""
+    watched, touched = parse_key(key), parse_key(changed)
+    size = min(len(watched), len(touched))
+    return watched[:size] == touched[:size]
+
+def _load_libc_inotify():
+    """Return libc handle if inotify is available, otherwise None"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+class _FileWatch(threading.Thread):
+    """Background watcher pushing changed key paths of one JSON file to subscribers
+
+    Uses inotify on the parent directory (so atomic replaces are seen),
+    falls back to polling mtime/size when inotify is unavailable.
+    """
+
+    def __init__(self, filepath: Path, interval: float = 1.0):
+        super().__init__(name=f"json-watch:{filepath.name}", daemon=True)
+        self.filepath = filepath
+        self.interval = interval
+        self.callbacks = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.data = _read_disk(filepath)
+        self.backend = 'polling'
+        self._fd = None
+        self._signature = self._stat()
+
+        libc = _load_libc_inotify()
+        if libc and filepath.parent.is_dir():
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                wd = libc.inotify_add_watch(fd, str(filepath.parent).encode(), _IN_WATCH_MASK)
+                if wd >= 0:
+                    self._fd = fd
+                    self.backend = 'inotify'
+                else:
+                    os.close(fd)
+
+    def _stat(self):
+        """File signature plus content hash (same-size rewrites within one mtime tick)"""
+        try:
+            st = os.stat(self.filepath)
+            with open(self.filepath, 'rb') as f:
+                digest = _content_digest(f.read())
+            return st.st_mtime_ns, st.st_size, st.st_ino, digest
+        except OSError:
+            return None
+
+    def _wait_inotify(self) -> bool:
+        """Block until the watched file is touched; True if it was"""
+        ready, _, _ = select.select([self._fd], [], [], self.interval)
+        if not ready:
+            return False
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+
+        touched, offset, name = False, 0, self.filepath.name.encode()
+        while offset + _IN_EVENT.size <= len(buffer):
+            _, _, _, length = _IN_EVENT.unpack_from(buffer, offset)
+            offset += _IN_EVENT.size
+            event_name = buffer[offset:offset + length].rstrip(b'\0')
+            offset += length
+            touched = touched or event_name == name
+        return touched
+
+    def _wait_polling(self) -> bool:
+        """Sleep one interval and report whether file signature changed"""
+        if self.stopped.wait(self.interval):
+            return False
+        signature = self._stat()
+        changed, self._signature = signature != self._signature, signature
+        return changed
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                touched = self._wait_inotify() if self._fd is not None else self._wait_polling()
+                if touched and not self.stopped.is_set():
+                    self.check()
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+
+    def check(self):
+        """Re-read file and notify subscribers about changed key paths"""
+        data = _read_disk(self.filepath)
+        changed = _diff_keys(self.data, data)
+        self.data = data
+        if not changed:
+            return
+
+        with self.lock:
+            callbacks = list(self.callbacks)
+        for callback, key in callbacks:
+            keys = [k for k in changed if _key_related(key, k)] if key else changed
+            if not keys:
+                continue
+            try:
+                callback(keys, data)
+            except Exception:
+                logger.error(f"Error in change callback for {self.filepath}", exc_info=True)
+
+    def stop(self):
+        self.stopped.set()
+
+
+def subscribe(filepath: str | Path, callback: Callable[[list[str], dict], None],
+              key: str = None, interval: float = 1.0) -> Callable[[], None]:
+    """
+    Register callback for changes of JSON file (inotify, polling fallback)
+
+    Args:
+        filepath: JSON file to watch
+        callback: Called as callback(changed_keys, data) from watcher thread
+        key (optional): Dot-separated path; notify only about changes under/over it
+        interval: Polling interval in seconds (also inotify stop latency)
+
+    Returns:
+        Function removing this subscription
+    """
+    filepath = Path(filepath).absolute()
+    with _watches_lock:
+        watch = _watches.get(filepath)
+        if watch is None or not watch.is_alive():
+            watch = _FileWatch(filepath, interval)
+            _watches[filepath] = watch
+            watch.start()
+        with watch.lock:
+            watch.callbacks.append((callback, key))
+
+    return lambda: unsubscribe(filepath, callback)
+
+def unsubscribe(filepath: str | Path, callback: Callable = None):
+    """
+    Remove callback (or all callbacks) for JSON file, stop idle watcher
+
+    Args:
+        filepath: Watched JSON file
+        callback (optional): Callback to remove; all if omitted
+    """
+    filepath = Path(filepath).absolute()
+    with _watches_lock:
+        watch = _watches.get(filepath)
+        if watch is None:
+            return
+        with watch.lock:
+            watch.callbacks = [(cb, key) for cb, key in watch.callbacks
+                               if callback is not None and cb != callback]
+            idle = not watch.callbacks
+        if idle:
+            watch.stop()
+            del _watches[filepath]
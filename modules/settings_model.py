@@ -0,0 +1,251 @@
+""" Settings Model Module | by ANXETY """
+
+import modules.json_utils as js
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Optional, Union, get_args, get_origin
+from pathlib import Path
+import types
+import os
+
+
+# ======================== SECTIONS ========================
+
+@dataclass(slots=True)
+class EnvironmentSettings:
+    """Typed view of the ENVIRONMENT section"""
+    env_name: str = ''
+    lang: str = 'en'
+    fork: str = 'anxety-solo/sd-webui'
+    branch: str = 'main'
+    start_timer: Optional[float] = None
+    public_ip: Optional[str] = None
+    install_deps: bool = False
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class WidgetSettings:
+    """Typed view of the WIDGETS section (values saved by the widgets cell)"""
+    XL_models: bool = False
+    model: str = 'none'
+    model_num: str = ''
+    inpainting_model: bool = False
+    vae: str = 'none'
+    vae_num: str = ''
+    latest_webui: bool = False
+    latest_extensions: bool = False
+    check_custom_nodes_deps: bool = True
+    change_webui: str = 'A1111'
+    detailed_download: str = 'off'
+    controlnet: str = 'none'
+    controlnet_num: str = ''
+    commit_hash: str = ''
+    civitai_token: str = ''
+    huggingface_token: str = ''
+    zrok_token: str = ''
+    ngrok_token: str = ''
+    commandline_arguments: str = ''
+    theme_accent: str = 'anxety'
+    empowerment: bool = False
+    empowerment_output: str = ''
+    Model_url: str = ''
+    Vae_url: str = ''
+    LoRA_url: str = ''
+    Embedding_url: str = ''
+    Extensions_url: str = ''
+    ADetailer_url: str = ''
+    custom_file_urls: str = ''
+    extra: dict = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class WebUISettings:
+    """Typed view of the WEBUI section (see webui_utils.get_webui_paths)"""
+    current: str = 'A1111'
+    latest: Optional[str] = None
+    webui_path: str = ''
+    model_dir: str = ''
+    vae_dir: str = ''
+    lora_dir: str = ''
+    embed_dir: str = ''
+    extension_dir: str = ''
+    control_dir: str = ''
+    upscale_dir: str = ''
+    output_dir: str = ''
+    config_dir: str = ''
+    adetailer_dir: str = ''
+    clip_dir: str = ''
+    unet_dir: str = ''
+    vision_dir: str = ''
+    encoder_dir: str = ''
+    diffusion_dir: str = ''
+    extra: dict = field(default_factory=dict)
+
+
+# Section key -> model; later sections win on flat access (same as {**ENV, **WIDGETS, **WEBUI})
+SECTIONS = {
+    'ENVIRONMENT': EnvironmentSettings,
+    'WIDGETS': WidgetSettings,
+    'WEBUI': WebUISettings
+}
+
+_FIELD_SECTION = {
+    f.name: section
+    for section, model in SECTIONS.items()
+    for f in fields(model) if f.name != 'extra'
+}
+
+
+# ======================= VALIDATION =======================
+
+def _matches(value: Any, annotation: Any) -> bool:
+    """Check value against a (simple) type annotation"""
+    if annotation is Any:
+        return True
+
+    origin = get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        return any(_matches(value, arg) for arg in get_args(annotation))
+    if annotation is type(None):
+        return value is None
+    if annotation is float:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    if annotation is int:
+        return isinstance(value, int) and not isinstance(value, bool)
+    return isinstance(value, origin or annotation)
+
+def _parse_section(model: type, name: str, raw: Any) -> tuple[Any, frozenset]:
+    """
+    Build section model from raw dict, replacing invalid values with defaults
+
+    Returns the model and the names of the fields actually loaded from raw.
+    """
+    if not isinstance(raw, dict):
+        if raw is not None:
+            print(f"[settings_model] Warning: Section '{name}' is not an object. Using defaults.")
+        return model(), frozenset()
+
+    values, extra = {}, dict(raw)
+    for f in fields(model):
+        if f.name == 'extra' or f.name not in raw:
+            continue
+        value = extra.pop(f.name)
+        if _matches(value, f.type):
+            values[f.name] = value
+        else:
+            print(f"[settings_model] Warning: '{name}.{f.name}' has invalid value {value!r}. Using default.")
+    return model(**values, extra=extra), frozenset(values)
+
+
+# ========================= MODEL ==========================
+
+@dataclass(slots=True)
+class Settings:
+    """
+    Typed settings document with lazily parsed sections
+
+    Sections are decoded and validated on first access only. Flat attribute
+    access (settings.zrok_token) resolves fields across sections with the
+    same precedence as the old merged dict, and get()/[] keep dict-style
+    call sites working. Attributes fall back to the model defaults, while
+    get() returns its default for fields missing from the file (dict.get).
+    """
+    path: Path
+    signature: Optional[tuple] = None
+    _sections: dict = field(default_factory=dict, repr=False)
+    _loaded: dict = field(default_factory=dict, repr=False)
+
+    def section(self, name: str):
+        """Return parsed section model by section key"""
+        parsed = self._sections.get(name)
+        if parsed is None:
+            parsed, self._loaded[name] = _parse_section(SECTIONS[name], name, js.read(self.path, name))
+            self._sections[name] = parsed
+        return parsed
+
+    def loaded(self, name: str) -> bool:
+        """Check if a setting was present (and valid) in the file rather than defaulted"""
+        section = _FIELD_SECTION.get(name)
+        if section is not None:
+            self.section(section)
+            return name in self._loaded[section]
+        return any(name in self.section(key).extra for key in SECTIONS)
+
+    @property
+    def environment(self) -> EnvironmentSettings:
+        return self.section('ENVIRONMENT')
+
+    @property
+    def widgets(self) -> WidgetSettings:
+        return self.section('WIDGETS')
+
+    @property
+    def webui(self) -> WebUISettings:
+        return self.section('WEBUI')
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        section = _FIELD_SECTION.get(name)
+        if section is not None:
+            return getattr(self.section(section), name)
+
+        for key in reversed(SECTIONS):
+            extra = self.section(key).extra
+            if name in extra:
+                return extra[name]
+        raise AttributeError(f"Setting '{name}' not found")
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Dict-style access with default for missing settings"""
+        if not self.loaded(name):
+            return default
+        try:
+            value = getattr(self, name)
+        except AttributeError:
+            return default
+        return default if value is None else value
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def as_dict(self) -> dict:
+        """Flat merged dict of all sections (old load_settings() layout)"""
+        merged = {}
+        for key in SECTIONS:
+            parsed = self.section(key)
+            merged.update(parsed.extra)
+            merged.update({f.name: getattr(parsed, f.name) for f in fields(parsed) if f.name != 'extra'})
+        return merged
+
+
+_instances = {}
+
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = os.stat(path)
+        return st.st_mtime_ns, st.st_size, st.st_ino
+    except OSError:
+        return None
+
+def load_settings(path: str | Path) -> Settings:
+    """
+    Return shared Settings object for settings file
+
+    The same instance is returned while the file is unchanged on disk, so
+    every module of a process shares already parsed sections.
+    """
+    path = Path(path)
+    key = os.path.abspath(path)
+    signature = _signature(path)
+
+    settings = _instances.get(key)
+    if settings is None or settings.signature != signature:
+        settings = Settings(path, signature)
+        _instances[key] = settings
+    return settings
@@ -0,0 +1,392 @@
+""" Snapshot Utilities Module | by ANXETY """
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Optional
+from pathlib import Path, PurePosixPath
+import subprocess
+import threading
+import argparse
+import requests
+import tarfile
+import hashlib
+import shutil
+import time
+import json
+import site
+import sys
+import re
+import os
+import io
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+HOME = Path(os.environ.get('home_path', os.environ.get('HOME', '/content')))
+SNAPSHOT_DIR = Path(os.environ.get('ANXLIGHT_SNAPSHOT_DIR', HOME / '.cache' / 'anxlight' / 'snapshots'))
+
+LAYER_DIRS = ('extensions', 'custom_nodes')                  # Every entry becomes its own layer
+EXCLUDE_NAMES = {'__pycache__', '.ipynb_checkpoints'}
+MAX_FILE_SIZE = 256 * 1024 * 1024                            # Keep models and other big downloads out
+CHUNK_SIZE = 1024 * 1024
+ZSTD_LEVEL = 10
+
+
+def snapshot_key(ui: str, env_name: str = '', fork: str = '', branch: str = '') -> str:
+    """
+    Snapshot name for a UI install in a given environment and repo fork/branch
+
+    Installs differ per env (Kaggle-only extensions) and per fork/branch
+    (configs), so a snapshot is only reused where it was built.
+    """
+    parts = [ui, env_name, fork, branch]
+    return '@'.join(re.sub(r'[^\w.-]+', '_', p) for p in parts if p)
+
+
+# ====================== ZSTD STREAMS ======================
+
+def zstd_available() -> bool:
+    return zstandard is not None or shutil.which('zstd') is not None
+
+@contextmanager
+def zstd_writer(path: Path, level: int = ZSTD_LEVEL) -> Iterator[BinaryIO]:
+    """Writable stream compressing into path with all cores (zstandard, else the zstd CLI)"""
+    with open(path, 'wb') as f:
+        if zstandard is not None:
+            with zstandard.ZstdCompressor(level=level, threads=-1).stream_writer(f, closefd=False) as writer:
+                yield writer
+            return
+
+        process = subprocess.Popen(['zstd', f"-{level}", '-T0', '-q', '-c'], stdin=subprocess.PIPE, stdout=f)
+        try:
+            yield process.stdin
+        finally:
+            process.stdin.close()
+            if process.wait() != 0:
+                raise IOError(f"zstd exited with {process.returncode}")
+
+@contextmanager
+def zstd_reader(source: BinaryIO) -> Iterator[BinaryIO]:
+    """Readable decompressed stream over a compressed source (file or HTTP body)"""
+    if zstandard is not None:
+        with zstandard.ZstdDecompressor().stream_reader(source, read_size=CHUNK_SIZE) as reader:
+            yield reader
+        return
+
+    # Plain files go straight to zstd's stdin; HTTP bodies (which expose the raw socket fd) are fed by a thread
+    local = isinstance(source, (io.BufferedReader, io.FileIO))
+    process = subprocess.Popen(['zstd', '-d', '-q', '-c'], stdin=source if local else subprocess.PIPE, stdout=subprocess.PIPE)
+    feeder = None
+    if not local:
+        def feed():
+            try:
+                while chunk := source.read(CHUNK_SIZE):
+                    process.stdin.write(chunk)
+            except BrokenPipeError:
+                pass
+            finally:
+                process.stdin.close()
+        feeder = threading.Thread(target=feed, daemon=True)
+        feeder.start()
+    try:
+        yield process.stdout
+    finally:
+        process.stdout.close()
+        if feeder:
+            feeder.join()
+        if process.wait() != 0:
+            raise IOError(f"zstd exited with {process.returncode}")
+
+
+class _Hashing:
+    """Pass-through stream hashing everything written or read"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.hash.update(data)
+        self.size += len(data)
+        return self.stream.write(data)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.stream.read(size)
+        self.hash.update(data)
+        self.size += len(data)
+        return data
+
+    def drain(self) -> None:
+        while self.read(CHUNK_SIZE):
+            pass
+
+
+# ========================= BUILD ==========================
+
+def _escapes(path: Path, root: Path) -> bool:
+    """Check if symlink path points outside root (absolute or via ..), which the 'data' extraction filter refuses"""
+    target = os.readlink(path)
+    if os.path.isabs(target):
+        return True
+    resolved = os.path.normpath(os.path.join(os.path.dirname(path), target))
+    return os.path.commonpath([resolved, str(root)]) != str(root)
+
+def _walk(root: Path, skip: set[Path], too_big: list[str], links: list[str]) -> Iterator[Path]:
+    """
+    Deterministic (sorted) walk of root, yielding dirs before their contents
+
+    Files over MAX_FILE_SIZE go to too_big, symlinks pointing outside root to
+    links; neither is packed, since restore could not extract them.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        base = Path(dirpath)
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDE_NAMES and base / d not in skip)
+        for name in sorted(dirnames) + sorted(filenames):
+            path = base / name
+            if name in EXCLUDE_NAMES or path in skip:
+                continue
+            if path.is_symlink():
+                if _escapes(path, root):
+                    links.append(str(path.relative_to(root)))
+                    continue
+            elif path.is_file() and path.stat().st_size > MAX_FILE_SIZE:
+                too_big.append(str(path.relative_to(root)))
+                continue
+            yield path
+
+def _normalize(info: tarfile.TarInfo) -> tarfile.TarInfo:
+    info.uid = info.gid = 0
+    info.uname = info.gname = ''
+    return info
+
+def build_layer(root: Path, store: Path, skip: set[Path] = frozenset(), level: int = ZSTD_LEVEL) -> dict:
+    """
+    Pack root into a zstd tar layer named by the sha256 of its tar stream
+
+    Layers already present in store (same digest) are not written twice, so
+    unchanged extensions are shared between snapshots.
+    """
+    store.mkdir(parents=True, exist_ok=True)
+    tmp = store / f".layer-{os.getpid()}-{threading.get_ident()}.tmp"
+    files, too_big, links = 0, [], []
+    with zstd_writer(tmp, level) as compressed:
+        hashing = _Hashing(compressed)
+        with tarfile.open(fileobj=hashing, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+            for path in _walk(root, set(skip), too_big, links):
+                tar.add(path, arcname=str(path.relative_to(root)), recursive=False, filter=_normalize)
+                files += 1
+
+    digest = hashing.hash.hexdigest()
+    target = store / f"{digest}.tar.zst"
+    if target.exists():
+        tmp.unlink()
+    else:
+        tmp.rename(target)
+    layer = {'digest': digest, 'size': target.stat().st_size, 'tar_size': hashing.size, 'files': files}
+    if too_big:
+        layer['skipped'] = too_big    # Not in the snapshot: must come from the regular download path
+    if links:
+        layer['skipped_links'] = links
+    return layer
+
+def build_snapshot(webui: str | Path, name: str, store: str | Path = SNAPSHOT_DIR,
+                   extra: dict[str, str | Path] = None, log: bool = True) -> Path:
+    """
+    Capture an installed WebUI as a layered snapshot, returns the manifest path
+
+    Layers: the WebUI itself (without LAYER_DIRS), one per extension /
+    custom node, and one per `extra` {name: absolute dir} outside the WebUI
+    (e.g. patched site-packages). The manifest <name>.json lists them in
+    restore order.
+    """
+    webui, store = Path(webui).resolve(), Path(store)
+    start = time.time()
+
+    # (layer name, root dir, path inside the WebUI or None for absolute roots)
+    jobs = [('webui', webui, '.')]
+    for layer_dir in (webui / d for d in LAYER_DIRS if (webui / d).is_dir()):
+        for entry in sorted(layer_dir.iterdir()):
+            if entry.is_dir() and entry.name not in EXCLUDE_NAMES:
+                jobs.append((f"{layer_dir.name}/{entry.name}", entry, str(entry.relative_to(webui))))
+    layered = {root for layer_name, root, _ in jobs[1:]}
+    for layer_name, root in (extra or {}).items():
+        if Path(root).is_dir():
+            jobs.append((layer_name, Path(root).resolve(), None))
+
+    def build(job):
+        layer_name, root, rel = job
+        skip = layered if layer_name == 'webui' else set()
+        layer = build_layer(root, store, skip)
+        layer.update({'name': layer_name, 'path': rel} if rel is not None else {'name': layer_name, 'root': str(root)})
+        return layer
+
+    # Compression is multi-threaded per layer already; a few layers at once keeps small ones flowing
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        layers = list(pool.map(build, jobs))
+
+    manifest = {
+        'name': name,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'webui': webui.name,
+        'layers': layers
+    }
+    manifest_path = store / f"{name}.json"
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+
+    if log:
+        for layer in layers:
+            for rel in layer.get('skipped', []):
+                print(f">> Snapshot '{name}': skipped {layer['name']}/{rel} (over {MAX_FILE_SIZE // 1024**2} MiB)")
+            for rel in layer.get('skipped_links', []):
+                print(f">> Snapshot '{name}': skipped {layer['name']}/{rel} (symlink outside the layer)")
+        total = sum(l['size'] for l in layers)
+        print(f">> Snapshot '{name}': {len(layers)} layers, {total / 1024**2:.1f} MiB in {time.time() - start:.1f}s -> {manifest_path}")
+    return manifest_path
+
+
+# ======================== RESTORE =========================
+
+def _is_url(source: str | Path) -> bool:
+    return str(source).startswith(('http://', 'https://'))
+
+def load_manifest(name: str, source: str | Path = SNAPSHOT_DIR) -> Optional[dict]:
+    """Read <name>.json from a local store or URL base, None if missing"""
+    try:
+        if _is_url(source):
+            response = requests.get(f"{str(source).rstrip('/')}/{name}.json", timeout=15)
+            return response.json() if response.ok else None
+        path = Path(source) / f"{name}.json"
+        return json.loads(path.read_text()) if path.exists() else None
+    except (OSError, ValueError, requests.RequestException):
+        return None
+
+@contextmanager
+def _open_layer(source: str | Path, digest: str) -> Iterator[BinaryIO]:
+    if _is_url(source):
+        with requests.get(f"{str(source).rstrip('/')}/{digest}.tar.zst", stream=True, timeout=60) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            yield response.raw
+    else:
+        with open(Path(source) / f"{digest}.tar.zst", 'rb') as f:
+            yield f
+
+def _allowed_roots() -> list[Path]:
+    """Directories absolute-root layers may live in: the venv and this interpreter's site-packages"""
+    roots = [*site.getsitepackages(), site.getusersitepackages(), sys.prefix, os.environ.get('venv_path')]
+    return [Path(r).resolve() for r in roots if r]
+
+def _layer_target(layer: dict, staging: Path) -> tuple[Path, Optional[Path]]:
+    """
+    Validate a manifest layer entry, returns (staging dir to extract into, final root or None)
+
+    Manifests may come from a URL, so relative paths must stay inside the
+    WebUI and absolute roots must be strictly inside an allowed root.
+    """
+    if 'root' in layer:
+        root = Path(layer['root'])
+        resolved = root.resolve()
+        if not root.is_absolute() or not any(resolved != base and resolved.is_relative_to(base) for base in _allowed_roots()):
+            raise ValueError(f"Layer '{layer['name']}' root {root} is outside the allowed roots")
+        return resolved.parent / f".{resolved.name}.restore", resolved
+
+    rel = PurePosixPath(layer['path'])
+    if rel.is_absolute() or '..' in rel.parts:
+        raise ValueError(f"Layer '{layer['name']}' path {rel} escapes the WebUI")
+    return staging / rel, None
+
+def restore_layer(layer: dict, source: str | Path, dest: Path) -> None:
+    """
+    Stream one layer into dest (a staging dir, published by the caller only after every digest matched)
+
+    Layers may come from a URL, so members are extracted with the 'data' filter: absolute or
+    escaping paths and links, device files and setuid/world-writable modes are refused.
+    """
+    dest.mkdir(parents=True, exist_ok=True)
+    extract_args = {'filter': 'data'} if hasattr(tarfile, 'data_filter') else {}
+    with _open_layer(source, layer['digest']) as compressed, zstd_reader(compressed) as stream:
+        hashing = _Hashing(stream)
+        with tarfile.open(fileobj=hashing, mode='r|') as tar:
+            tar.extractall(dest, **extract_args)
+        hashing.drain()     # Tar end padding is part of the digest
+
+    if hashing.hash.hexdigest() != layer['digest']:
+        raise IOError(f"Layer '{layer['name']}' digest mismatch")
+
+def _publish_root(staged: Path, root: Path) -> None:
+    """Swap a staged root layer into place (old copy kept aside until the rename succeeded)"""
+    old = root.with_name(f".{root.name}.old")
+    shutil.rmtree(old, ignore_errors=True)
+    if root.exists():
+        root.rename(old)
+    staged.rename(root)
+    shutil.rmtree(old, ignore_errors=True)
+
+def restore_snapshot(name: str, dest: str | Path, source: str | Path = SNAPSHOT_DIR,
+                     workers: int = 4, log: bool = True) -> bool:
+    """
+    Restore snapshot <name> into dest (which must not exist yet)
+
+    Every layer, including absolute-root ones (e.g. a patched site-packages
+    module), is streamed and decompressed in parallel into a staging dir;
+    they are moved into place only once every layer's digest checked out, so
+    a failed restore leaves nothing half-installed. Manifest paths are
+    validated first (see _layer_target). Returns False if the snapshot is
+    missing or broken (caller falls back to a regular install).
+    """
+    dest = Path(dest)
+    manifest = load_manifest(name, source)
+    if manifest is None or not zstd_available() or dest.exists():
+        return False
+
+    staging = dest.with_name(f".{dest.name}.restore")
+    start = time.time()
+    targets = []
+    try:
+        targets = [_layer_target(layer, staging) for layer in manifest['layers']]
+        for path in {staging, *(target for target, root in targets if root)}:
+            shutil.rmtree(path, ignore_errors=True)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda args: restore_layer(args[0], source, args[1][0]), zip(manifest['layers'], targets)))
+
+        for target, root in targets:
+            if root:
+                _publish_root(target, root)
+        staging.rename(dest)
+    except Exception as e:
+        for path in {staging, *(target for target, root in targets if root)}:
+            shutil.rmtree(path, ignore_errors=True)
+        if log:
+            print(f">> Snapshot '{name}' restore failed: {e}")
+        return False
+
+    if log:
+        print(f">> Restored snapshot '{name}' ({len(manifest['layers'])} layers) in {time.time() - start:.1f}s")
+    return True
+
+
+# ========================== CLI ===========================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build or restore layered WebUI snapshots')
+    parser.add_argument('action', choices=('build', 'restore'))
+    parser.add_argument('ui', help='UI name')
+    parser.add_argument('webui', help='WebUI directory to capture / restore into')
+    parser.add_argument('--env', default='', help='Environment name (e.g. Kaggle), part of the snapshot key')
+    parser.add_argument('--fork', default='', help='Repo fork, part of the snapshot key')
+    parser.add_argument('--branch', default='', help='Repo branch, part of the snapshot key')
+    parser.add_argument('--store', default=str(SNAPSHOT_DIR), help='Snapshot dir or URL base')
+    parser.add_argument('--extra', action='append', default=[], metavar='NAME=DIR',
+                        help='Extra absolute directory layer (build only)')
+    args = parser.parse_args()
+
+    name = snapshot_key(args.ui, args.env, args.fork, args.branch)
+    if args.action == 'build':
+        build_snapshot(args.webui, name, args.store, dict(e.split('=', 1) for e in args.extra))
+    elif not restore_snapshot(name, args.webui, args.store):
+        raise SystemExit(1)
@@ -0,0 +1,193 @@
+""" Trace Utilities Module | by ANXETY """
+
+from contextlib import contextmanager
+from collections import defaultdict
+from typing import Iterator, Optional
+from contextvars import ContextVar
+from pathlib import Path
+import itertools
+import threading
+import json
+import time
+import sys
+import os
+
+
+TRACE_ENV = 'ANXLIGHT_TRACE'                # '1' or a JSONL path; unset/'0' disables tracing
+PARENT_ENV = 'ANXLIGHT_TRACE_PARENT'        # Span id that root spans of child processes hang under
+
+HOME = Path(os.environ.get('home_path', os.environ.get('HOME', '/content')))
+DEFAULT_TRACE = HOME / 'anxlight_trace.jsonl'
+
+_current: ContextVar[Optional[str]] = ContextVar('anxlight_span', default=None)
+_ids = itertools.count(1)
+_write_lock = threading.Lock()
+_named_process = False
+
+
+# ======================== RECORDING =======================
+
+def trace_path() -> Optional[Path]:
+    value = os.environ.get(TRACE_ENV, '')
+    if value in ('', '0'):
+        return None
+    return DEFAULT_TRACE if value == '1' else Path(value)
+
+def start_trace(path: Optional[Path] = None) -> Optional[Path]:
+    """Begin a fresh trace file and export its path so child processes append to it"""
+    path = Path(path) if path else trace_path()
+    if path is None:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    os.environ[TRACE_ENV] = str(path)
+    return path
+
+def _write(path: Path, event: dict) -> None:
+    global _named_process
+    lines = []
+    if not _named_process:
+        _named_process = True
+        lines.append({'ph': 'M', 'name': 'process_name', 'pid': os.getpid(),
+                      'args': {'name': Path(sys.argv[0]).name or 'python'}})
+    lines.append(event)
+    data = ''.join(json.dumps(line) + '\n' for line in lines).encode()
+    # Single O_APPEND write per batch keeps lines from concurrent processes intact
+    with _write_lock:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+@contextmanager
+def span(name: str, cat: str = 'install', export: bool = False, **args) -> Iterator[dict]:
+    """
+    Record a trace span around the block (no-op unless ANXLIGHT_TRACE is set)
+
+    Yields the args dict so the block can attach results. Nesting follows the
+    asyncio/thread context; export=True also makes child processes started in
+    the block nest their spans under this one.
+    """
+    path = trace_path()
+    if path is None:
+        yield args
+        return
+
+    span_id = f"{os.getpid()}.{next(_ids)}"
+    parent = _current.get() or os.environ.get(PARENT_ENV)
+    token = _current.set(span_id)
+    previous_env = os.environ.get(PARENT_ENV)
+    if export:
+        os.environ[PARENT_ENV] = span_id
+
+    start = time.time()
+    try:
+        yield args
+    except BaseException as e:
+        args['error'] = repr(e)[:200]
+        raise
+    finally:
+        end = time.time()
+        _current.reset(token)
+        if export:
+            if previous_env is None:
+                os.environ.pop(PARENT_ENV, None)
+            else:
+                os.environ[PARENT_ENV] = previous_env
+        _write(path, {
+            'ph': 'X', 'name': name, 'cat': cat,
+            'ts': int(start * 1e6), 'dur': int((end - start) * 1e6),
+            'pid': os.getpid(), 'tid': threading.get_native_id(),
+            'args': {**args, 'id': span_id, 'parent': parent}
+        })
+
+
+# ===================== CRITICAL PATH ======================
+
+def critical_path(events: list[dict]) -> list[dict]:
+    """
+    Chain of spans that determined the total duration
+
+    Walks back from the end of the trace: among sibling spans, the one that
+    ended last before the current point is on the path, then the walk jumps
+    to its start. Spans with children are replaced by their own inner path.
+    """
+    spans = [e for e in events if e.get('ph') == 'X']
+    ids = {e['args']['id'] for e in spans}
+    children = defaultdict(list)
+    for e in spans:
+        parent = e['args'].get('parent')
+        children[parent if parent in ids else None].append(e)
+
+    slack = 1000    # us; sequential steps touch within clock jitter
+
+    def walk(siblings: list[dict], end: int) -> list[dict]:
+        chain, point = [], end
+        while True:
+            candidates = [s for s in siblings if s['ts'] + s['dur'] <= point + slack and s not in chain]
+            if not candidates:
+                break
+            last = max(candidates, key=lambda s: (s['ts'] + s['dur'], s['ts']))
+            chain.append(last)
+            point = last['ts']
+
+        path = []
+        for s in reversed(chain):
+            kids = children.get(s['args']['id'])
+            path.extend(walk(kids, s['ts'] + s['dur']) if kids else [s])
+        return path
+
+    roots = children[None]
+    if not roots:
+        return []
+    return walk(roots, max(s['ts'] + s['dur'] for s in roots))
+
+def finalize_trace(out_path: Optional[Path] = None, env_name: str = '', log: bool = True) -> Optional[Path]:
+    """
+    Convert the JSONL trace to Chrome trace-event JSON (chrome://tracing, Perfetto)
+
+    The critical path is repeated on its own 'Critical path' track and listed
+    in otherData together with the environment name.
+    """
+    path = trace_path()
+    if path is None or not path.exists():
+        return None
+
+    events = []
+    for line in path.read_text().splitlines():
+        try:
+            events.append(json.loads(line))
+        except ValueError:
+            continue
+    spans = [e for e in events if e.get('ph') == 'X']
+    if not spans:
+        return None
+
+    critical = critical_path(events)
+    begin = min(e['ts'] for e in spans)
+    total = max(e['ts'] + e['dur'] for e in spans) - begin
+
+    track = [{'ph': 'M', 'name': 'process_name', 'pid': 0, 'args': {'name': 'Critical path'}}]
+    track += [{**e, 'pid': 0, 'tid': 0, 'cat': 'critical'} for e in critical]
+
+    out_path = Path(out_path) if out_path else path.with_suffix('.json')
+    out_path.write_text(json.dumps({
+        'traceEvents': events + track,
+        'displayTimeUnit': 'ms',
+        'otherData': {
+            'env_name': env_name,
+            'total_ms': round(total / 1000, 1),
+            'critical_path': [{'name': e['name'], 'ms': round(e['dur'] / 1000, 1)} for e in critical]
+        }
+    }))
+
+    if log:
+        print(f"⏱️ Setup trace: {total / 1e6:.1f}s total ({env_name or 'unknown env'}) -> {out_path}")
+        for e in critical:
+            share = e['dur'] / total * 100 if total else 0
+            print(f"   {e['dur'] / 1e6:7.2f}s {share:5.1f}%  {e['name']}")
+        untraced = total - sum(e['dur'] for e in critical)
+        if total and untraced > 0:
+            print(f"   {untraced / 1e6:7.2f}s {untraced / total * 100:5.1f}%  (untraced: process start-up, waits)")
+    return out_path
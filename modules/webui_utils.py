@@ -2,6 +2,8 @@
 
 import modules.json_utils as js
 
+from functools import lru_cache
+from types import MappingProxyType
 from pathlib import Path
 import json
 import os
@@ -58,28 +60,11 @@ ASSET_TYPE_TO_CONFIG_KEY_MAP = {
 
 # ===================== WEBUI HANDLERS =====================
 
-def update_current_webui(current_value: str) -> None:
-    """Update the current WebUI value and save settings."""
-    if not SETTINGS_PATH:
-        print("[webui_utils] ERROR: SETTINGS_PATH is not defined. Cannot update WebUI settings.")
-        return
-    current_stored = js.read(SETTINGS_PATH, 'WEBUI.current')
-    latest_value = js.read(SETTINGS_PATH, 'WEBUI.latest', None)
-
-    if latest_value is None or current_stored != current_value:
-        js.save(SETTINGS_PATH, 'WEBUI.latest', current_stored)
-        js.save(SETTINGS_PATH, 'WEBUI.current', current_value)
-
-    js.save(SETTINGS_PATH, 'WEBUI.webui_path', str(HOME / current_value))
-    _set_webui_paths(current_value)
-
+_current_webui = None
 
-def _set_webui_paths(ui: str) -> None:
-    """Configure paths for specified UI, fallback to A1111 for unknown UIs."""
-    if not SETTINGS_PATH:
-        print("[webui_utils] ERROR: SETTINGS_PATH is not defined. Cannot set WebUI paths.")
-        return
-        
+@lru_cache(maxsize=None)
+def get_webui_paths(ui: str) -> MappingProxyType:
+    """Return immutable directory table for specified UI, fallback to A1111 structure for unknown UIs."""
     selected_ui_name = ui if ui in WEBUI_PATHS else DEFAULT_UI
     if ui not in WEBUI_PATHS:
         print(f"[webui_utils] Warning: UI '{ui}' not in WEBUI_PATHS. Falling back to '{DEFAULT_UI}' for path structure.")
@@ -92,17 +77,17 @@ def _set_webui_paths(ui: str) -> None:
 
     is_comfy = ui == 'ComfyUI'
     is_classic_or_forge = ui == 'Classic' or ui == 'Forge'
-    
+
     control_dir_name = 'controlnet' if is_comfy else 'ControlNet'
     embed_root_actual = models_root if (is_comfy or is_classic_or_forge) else webui_root
-    config_root_actual = webui_root / 'user/default' if is_comfy else webui_root 
-    
+    config_root_actual = webui_root / 'user/default' if is_comfy else webui_root
+
     adetailer_dir_name = 'ultralytics' if is_comfy else 'adetailer'
     clip_dir_name = 'clip' if is_comfy else 'text_encoder'
     unet_dir_name = 'unet' if is_comfy else 'text_encoder'
     text_encoders_dir_name = 'text_encoders' if is_comfy else 'text_encoder'
 
-    path_config = {
+    return MappingProxyType({
         'model_dir': str(models_root / checkpoint),
         'vae_dir': str(models_root / vae),
         'lora_dir': str(models_root / lora),
@@ -118,19 +103,48 @@ def _set_webui_paths(ui: str) -> None:
         'vision_dir': str(models_root / 'clip_vision'),
         'encoder_dir': str(models_root / text_encoders_dir_name),
         'diffusion_dir': str(models_root / 'diffusion_models')
-    }
-    js.update(SETTINGS_PATH, 'WEBUI', path_config)
+    })
+
+
+def update_current_webui(current_value: str) -> None:
+    """Update the current WebUI value and paths, writing settings only if something changed."""
+    global _current_webui
+    if not SETTINGS_PATH:
+        print("[webui_utils] ERROR: SETTINGS_PATH is not defined. Cannot update WebUI settings.")
+        return
+
+    stored = js.read(SETTINGS_PATH, 'WEBUI', {})
+    section = dict(stored)
+    current_stored = stored.get('current')
+
+    if stored.get('latest') is None or current_stored != current_value:
+        section['latest'] = current_stored
+        section['current'] = current_value
+
+    # Same UI: keep directories the user saved; switching UI resets them to its defaults
+    section['webui_path'] = str(HOME / current_value)
+    for key, value in get_webui_paths(current_value).items():
+        if current_stored != current_value or not section.get(key):
+            section[key] = value
+
+    if section != stored:
+        js.save(SETTINGS_PATH, 'WEBUI', section)
+    _current_webui = current_value
+
+
+def _stored_webui_section() -> dict:
+    # json_utils caches sections keyed on the file's stat signature (plus a content
+    # hash while racy), so saves from other modules or processes are seen here
+    return (js.read(SETTINGS_PATH, 'WEBUI', {}) if SETTINGS_PATH else None) or {}
 
 
 def get_webui_asset_path(webui_name: str, asset_type_plural: str, asset_filename: str) -> str:
     """
     Gets the absolute path for a given asset type and filename for the specified WebUI.
-    It reads the pre-configured directory paths from anxlight_config.json.
-    Assumes update_current_webui() has already been called for the session to populate these paths.
+    Directories saved in the settings WEBUI section for that UI take precedence (user
+    overrides), otherwise the in-memory table of get_webui_paths() is used. The section
+    comes from json_utils' validated cache, so repeated lookups only stat the file.
     """
-    if not SETTINGS_PATH:
-        print("[webui_utils] ERROR: SETTINGS_PATH is not defined. Cannot get asset path.")
-        return ""
     if not asset_filename:
         print(f"[webui_utils] Warning: asset_filename is empty for asset type '{asset_type_plural}'. Cannot determine path.")
         return ""
@@ -140,19 +154,16 @@ def get_webui_asset_path(webui_name: str, asset_type_plural: str, asset_filename
         print(f"[webui_utils] Warning: Unknown asset_type_plural '{asset_type_plural}' for path mapping. Cannot determine path for '{asset_filename}'.")
         return ""
 
+    stored = _stored_webui_section()
+    if not webui_name:
+        webui_name = _current_webui or stored.get('current') or DEFAULT_UI
+
     try:
-        asset_dir = js.read(SETTINGS_PATH, f'WEBUI.{config_key}')
-        if asset_dir and isinstance(asset_dir, str) and Path(asset_dir).is_absolute():
-            return str(Path(asset_dir) / asset_filename)
-        elif asset_dir and isinstance(asset_dir, str):
-            print(f"[webui_utils] Warning: Path for '{config_key}' is relative: '{asset_dir}'. Resolving against HOME: {HOME}")
-            return str(HOME / asset_dir / asset_filename)
-        else:
-            print(f"[webui_utils] Warning: Directory path for '{config_key}' (asset type '{asset_type_plural}') not found or invalid in config for WebUI '{webui_name}'. Path read: {asset_dir}")
-            return ""
-            
+        saved = stored.get(config_key) if stored.get('current') == webui_name else None
+        asset_dir = saved or get_webui_paths(webui_name)[config_key]
+        return str(Path(asset_dir) / asset_filename)
     except Exception as e:
-        print(f"[webui_utils] Error reading/determining path for {asset_type_plural} '{asset_filename}' for WebUI '{webui_name}': {e}")
+        print(f"[webui_utils] Error determining path for {asset_type_plural} '{asset_filename}' for WebUI '{webui_name}': {e}")
         return ""
 
 def get_webui_installation_root(webui_name: str) -> str:
@@ -10,6 +10,7 @@ import shlex
 import shutil
 import zipfile
 import subprocess 
+import asyncio
 from pathlib import Path
 from urllib.parse import urlparse
 from datetime import timedelta
@@ -81,8 +82,12 @@ def clear_output_placeholder():
 
 try:
     from webui_utils import handle_setup_timer
+    from settings_model import load_settings as load_typed_settings
     from Manager import m_download, m_clone
     from CivitaiAPI import CivitAiAPI
+    from snapshot_utils import restore_snapshot, build_snapshot, snapshot_key, SNAPSHOT_DIR
+    from trace_utils import span, start_trace, finalize_trace
+    from git_utils import update_repos, find_repos, is_repo
     import json_utils as js
     print("[downloading-en.py] Successfully imported utility modules.")
 except ImportError as e:
@@ -98,16 +103,28 @@ except ImportError as e:
             def update(self, path, key, value): print(f"DummyJsonUtils.update called: path={path}, key={key}, value={value}")
             def key_exists(self, path, key, value=None): print(f"DummyJsonUtils.key_exists called: path={path}, key={key}, value={value}"); return False
             def save(self, path, key, value): print(f"DummyJsonUtils.save called: path={path}, key={key}, value={value}")
+            def enable_snapshot(self, path): pass
 
         js = DummyJsonUtils()
         print("[downloading-en.py] Using DUMMY json_utils.")
     # Define other dummies if necessary for script to not crash immediately
     if 'handle_setup_timer' not in globals():
         def handle_setup_timer(*args): print(f"Dummy handle_setup_timer called with {args}"); return None
+    if 'load_typed_settings' not in globals():
+        def load_typed_settings(path): print(f"Dummy load_typed_settings called with {path}"); return {}
     if 'm_download' not in globals():
         def m_download(*args): print(f"Dummy m_download called with {args}")
     if 'm_clone' not in globals():
         def m_clone(*args): print(f"Dummy m_clone called with {args}")
+    if 'span' not in globals():
+        from contextlib import nullcontext
+        def span(*args, **kwargs): return nullcontext({})
+        def start_trace(*args): return None
+        def finalize_trace(*args, **kwargs): return None
+    if 'update_repos' not in globals():
+        async def update_repos(*args, **kwargs): print(f"Dummy update_repos called with {args}"); return []
+        def find_repos(root): return []
+        def is_repo(path): return False
     if 'CivitAiAPI' not in globals():
         class CivitAiAPI:
             def __init__(self, token): print(f"Dummy CivitAiAPI initialized with token: {token}")
@@ -127,6 +144,12 @@ if not all([HOME, VENV, SCR_PATH, SETTINGS_PATH]):
     print("[downloading-en.py] CRITICAL ERROR: Essential path variables not found in environment.")
     sys.exit(1)
 
+# Span tracing (ANXLIGHT_TRACE=1 or a path): fresh trace, shared with the installer subprocesses
+start_trace()
+
+# Keep a parsed snapshot of settings next to the JSON for UI installer subprocesses
+js.enable_snapshot(SETTINGS_PATH)
+
 SCRIPTS = SCR_PATH / 'scripts'
 LANG, ENV_NAME, UI, WEBUI_PATH_STR = "en", "Unknown", "A1111", ""
 WEBUI_DIR = None
@@ -220,41 +243,26 @@ if venv_needs_reinstall:
         venv_url = "https://huggingface.co/NagisaNao/ANXETY/resolve/main/python31015-venv-torch251-cu121-C-fca.tar.lz4"
         py_version_str = '(3.10.15)'
     print(f"♻️ Installing VENV {py_version_str}, this will take some time...")
-    setup_venv(venv_url)
+    with span('venv_restore', cat='venv', url=venv_url):
+        setup_venv(venv_url)
     clear_output_placeholder()
     js.update(SETTINGS_PATH, 'WEBUI.latest', current_ui_settings)
 
 # Renamed function to match original call sites (load_settings)
 def load_settings(path):
-    """Load settings from a JSON file."""
+    """Load typed settings; sections are parsed lazily on first access."""
     print(f"[downloading-en.py] Attempting to load settings from: {path}")
     try:
-        environment_settings = js.read(path, 'ENVIRONMENT') or {}
-        widgets_settings = js.read(path, 'WIDGETS') or {}
-        webui_settings = js.read(path, 'WEBUI') or {} # This might be sparsely populated by AnxLight initially
-        
-        all_settings = {}
-        all_settings.update(environment_settings)
-        all_settings.update(widgets_settings) 
-        # WEBUI specific settings from the original file structure, might not be fully present
-        # in AnxLight's initial config.json, but WIDGETS.change_webui is the primary driver.
-        all_settings['UI'] = widgets_settings.get('change_webui', UI) # Use WIDGETS.change_webui for current UI
-        all_settings['WEBUI_PATH_STR'] = webui_settings.get('webui_path', str(SCR_PATH / all_settings['UI'])) # Default path
-        all_settings['WEBUI_DIR'] = Path(all_settings['WEBUI_PATH_STR'])
-        
-        print(f"[downloading-en.py] Loaded settings: {list(all_settings.keys())}")
-        return all_settings
+        return load_typed_settings(path)
     except Exception as e:
         print(f"[downloading-en.py] Error in load_settings: {e}")
-        print(f"[downloading-en.py] Traceback: {traceback.format_exc()}")
         return {}
 
 settings = load_settings(SETTINGS_PATH)
-locals().update(settings) # This makes keys from 'settings' dict local variables
 
 # Re-evaluate WEBUI_DIR based on loaded settings, particularly UI from WIDGETS
-UI = settings.get('UI', UI) # Ensure UI is from the loaded settings
-WEBUI_DIR = Path(settings.get('WEBUI_PATH_STR', str(SCR_PATH / UI)))
+UI = settings.get('change_webui', UI) # Use WIDGETS.change_webui for current UI
+WEBUI_DIR = Path(settings.get('webui_path') or str(SCR_PATH / UI))
 print(f"[downloading-en.py] Effective UI: {UI}, WEBUI_DIR: {WEBUI_DIR}")
 
 
@@ -273,8 +281,23 @@ start_timer_val = js.read(SETTINGS_PATH, 'ENVIRONMENT.start_timer')
 if not WEBUI_DIR.exists():
     start_install_time = time.time() # Renamed variable
     print(f"⌚ Unpacking Stable Diffusion... | WEBUI: {COL.B}{UI}{COL.X}", end='')
-    ui_script = SCRIPTS / 'UIs' / f"{UI}.py"
-    run_python_script(str(ui_script), script_cwd=str(SCR_PATH))
+    # Known-good snapshot (local store or ANXLIGHT_SNAPSHOT_URL) replaces the zip + configs + clones round trips
+    snapshot_source = osENV.get('ANXLIGHT_SNAPSHOT_URL') or (SNAPSHOT_DIR if 'SNAPSHOT_DIR' in globals() else None)
+    # Keyed by env and fork/branch: Kaggle-only extensions or a fork's configs must not leak into other installs
+    snapshot_name = snapshot_key(UI, ENV_NAME, js.read(SETTINGS_PATH, 'ENVIRONMENT.fork') or 'anxety-solo/sd-webui',
+                                 js.read(SETTINGS_PATH, 'ENVIRONMENT.branch') or 'main') if 'snapshot_key' in globals() else UI
+    with span('snapshot_restore', cat='snapshot', ui=UI) as trace:
+        restored = 'restore_snapshot' in globals() and restore_snapshot(snapshot_name, WEBUI_DIR, snapshot_source)
+        trace['restored'] = bool(restored)
+    if not restored:
+        ui_script = SCRIPTS / 'UIs' / f"{UI}.py"
+        # export: the installer subprocess nests its step / clone / unzip spans under this one
+        with span(f"webui_installer {UI}", cat='installer', export=True):
+            run_python_script(str(ui_script), script_cwd=str(SCR_PATH))
+        if osENV.get('ANXLIGHT_SNAPSHOT_BUILD') == '1' and 'build_snapshot' in globals() and WEBUI_DIR.exists():
+            extra = {'gradio_tunneling': p for p in VENV.glob('lib/python3*/site-packages/gradio_tunneling')}
+            with span('snapshot_build', cat='snapshot', ui=UI):
+                build_snapshot(WEBUI_DIR, snapshot_name, extra=extra)
     if 'handle_setup_timer' in globals(): handle_setup_timer(str(WEBUI_DIR), start_timer_val)
     install_time_val = time.time() - start_install_time # Renamed variable
     minutes, seconds = divmod(int(install_time_val), 60)
@@ -295,22 +318,14 @@ if settings.get('latest_webui') or settings.get('latest_extensions'):
     run_shell_command('git config --global user.email "you@example.com"', suppress_output=True)
     run_shell_command('git config --global user.name "Your Name"', suppress_output=True)
 
-    if settings.get('latest_webui'):
-        CD(str(WEBUI_DIR))
-        run_shell_command('git stash push --include-untracked', suppress_output=True)
-        run_shell_command('git pull --rebase', suppress_output=True)
-        run_shell_command('git stash pop', suppress_output=True, check_rc=False)
-
+    # One parallel fetch wave over the WebUI and every extension; only repos whose upstream moved are fast-forwarded
+    repos_to_update = []
+    if settings.get('latest_webui') and is_repo(WEBUI_DIR):
+        repos_to_update.append(WEBUI_DIR)   # Local changes are stashed and re-applied
     if settings.get('latest_extensions'):
-        ext_dir_path = WEBUI_DIR / 'extensions'
-        if ext_dir_path.is_dir():
-            for entry in os.listdir(ext_dir_path):
-                dir_p = ext_dir_path / entry
-                if dir_p.is_dir() and (dir_p / '.git').is_dir():
-                    print(f"Updating extension: {entry}")
-                    # Using subprocess.run directly for more control if needed
-                    subprocess.run(['git', 'reset', '--hard'], cwd=str(dir_p), capture_output=True)
-                    subprocess.run(['git', 'pull'], cwd=str(dir_p), capture_output=True)
+        repos_to_update += find_repos(WEBUI_DIR / 'extensions')
+    with span('update_repos', cat='git', repos=len(repos_to_update)):
+        asyncio.run(update_repos(repos_to_update, keep_local=[WEBUI_DIR], tag='downloading-en.py'))
     print(f"\\r✨ Update {action} Completed!")
 
 if UI == "A1111":
@@ -344,7 +359,7 @@ if ENV_NAME == 'Google Colab':
 print('📦 Downloading models and stuff (using placeholders for original complex logic)...')
 # The full original download logic (handle_submodels, process_file_downloads, download, manual_download etc.)
 # is very extensive. This refactor focuses on making the script runnable.
-# The actual download calls would need to use the settings variables populated by locals().update(settings).
+# The actual download calls would need to use the typed settings object (settings.model, settings.model_num, ...).
 # For example: model = settings.get('model'), model_num = settings.get('model_num'), etc.
 # And then the original logic using these variables would follow.
 
@@ -381,4 +396,6 @@ if UI == 'ComfyUI':
 # else:
 #     print(f"Warning: {download_result_script_path} not found.")
 
+finalize_trace(env_name=ENV_NAME)
+
 print(f"\\n--- {os.path.basename(__file__)} finished its tasks ---")
\ No newline at end of file
@@ -1,8 +1,9 @@
 # ~ launch.py | by ANXETY ~
 # Refactored by SuperAssistant to remove IPython dependencies and fix tunnel logic
 
-from modules.TunnelHub import Tunnel    # Tunneling
-import json_utils as js         # JSON
+from modules.settings_model import load_settings    # Settings
+from modules.TunnelHub import Tunnel, Timeline, EchoServer, PipeDrain, benchmark_url    # Tunneling
+import json_utils as js                             # JSON
 
 from datetime import timedelta
 from pathlib import Path
@@ -12,6 +13,9 @@ import requests
 import argparse
 import logging
 import asyncio
+import hashlib
+import shutil
+import signal
 import shlex
 import time
 import json
@@ -69,21 +73,8 @@ COL = COLORS
 
 # =================== loading settings V5 ==================
 
-def load_settings(path):
-    """Load settings from a JSON file."""
-    try:
-        return {
-            **js.read(path, 'ENVIRONMENT'),
-            **js.read(path, 'WIDGETS'),
-            **js.read(path, 'WEBUI')
-        }
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Error loading settings: {e}")
-        return {}
-
-# Load settings
+# Typed settings: sections are parsed lazily on first attribute access
 settings = load_settings(SETTINGS_PATH)
-locals().update(settings)
 
 
 # ==================== Helper Functions ====================
@@ -91,6 +82,9 @@ locals().update(settings)
 def parse_arguments():
     parser = argparse.ArgumentParser()
     parser.add_argument('-l', '--log', action='store_true', help='Show failed tunnel details')
+    parser.add_argument('-p', '--proxy', action='store_true', help='Serve tunnels through a local compressing reverse proxy')
+    parser.add_argument('-k', '--keep-tunnels', type=int, default=0,
+                        help='Benchmark tunnels and keep only the N fastest (0 = keep all, no benchmark)')
     return parser.parse_args()
 
 def _trashing():
@@ -105,7 +99,7 @@ def _update_config_paths():
     """Update configuration paths in WebUI config file"""
     config_mapping = {
         'tagger_hf_cache_dir': f"{WEBUI}/models/interrogators/",
-        'ad_extra_models_dir': adetailer_dir,
+        'ad_extra_models_dir': settings.adetailer_dir,
         # 'sd_checkpoint_hash': '',
         # 'sd_model_checkpoint': '',
         'sd_vae': 'None'
@@ -124,7 +118,7 @@ def _update_config_paths():
 
 def get_launch_command():
     """Construct launch command based on configuration"""
-    base_args = commandline_arguments
+    base_args = settings.commandline_arguments
     password = 'emoy4cnkm6imbysp84zmfiz1opahooblh7j34sgh'
 
     common_args = ' --enable-insecure-extension-access --disable-console-progressbars --theme dark'
@@ -132,8 +126,8 @@ def get_launch_command():
         common_args += f" --encrypt-pass={password}"
 
     # Accent Color For Anxety-Theme
-    if theme_accent != 'anxety':
-        common_args += f" --anxety {theme_accent}"
+    if settings.theme_accent != 'anxety':
+        common_args += f" --anxety {settings.theme_accent}"
 
     if UI == 'ComfyUI':
         return f"python3 main.py {base_args}"
@@ -143,32 +137,144 @@ def get_launch_command():
 
 # ======================== Tunneling =======================
 
+class ProviderRegistry:
+    """Cached tunnel provider state (binary paths, versions, auth, public IP) with TTLs, kept in settings"""
+
+    KEY = 'TUNNEL_PROVIDERS'
+    TTL = {'binary': 12 * 3600, 'version': 12 * 3600, 'auth': 12 * 3600, 'public_ip': 3600}
+    VERSION_FLAGS = {'cloudflared': '--version', 'ngrok': '--version', 'lt': '--version', 'zrok': 'version', 'ssh': '-V'}
+
+    def __init__(self):
+        self.cache = js.read(SETTINGS_PATH, self.KEY) or {}
+        self.changed = False
+
+    def _get(self, kind, name):
+        entry = self.cache.get(kind, {}).get(name)
+        if entry and time.time() - entry.get('time', 0) < self.TTL[kind]:
+            return entry['value']
+        return None
+
+    def _set(self, kind, name, value):
+        self.cache.setdefault(kind, {})[name] = {'value': value, 'time': int(time.time())}
+        self.changed = True
+        return value
+
+    def save(self):
+        """Persist cache if anything was refreshed"""
+        if self.changed:
+            js.save(SETTINGS_PATH, self.KEY, self.cache)
+            self.changed = False
+
+    def binary(self, command):
+        """Absolute path of command (missing binaries are not cached)"""
+        path = self._get('binary', command)
+        if path and os.access(path, os.X_OK):
+            return path
+        path = shutil.which(command)
+        return self._set('binary', command, path) if path else None
+
+    async def version(self, command):
+        """First line of the version output of command, cached per binary path and mtime"""
+        flag = self.VERSION_FLAGS.get(command)
+        path = self.binary(command)
+        if not flag or not path:
+            return None
+        key = f"{path}:{os.stat(path).st_mtime_ns}"
+        cached = self._get('version', key)
+        if cached:
+            return cached
+
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                path, flag, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+            )
+            output, _ = await asyncio.wait_for(proc.communicate(), timeout=10)
+        except Exception:
+            return None
+        line = output.decode(errors='replace').strip().split('\n')[0]
+        return self._set('version', key, line) if line else None
+
+    def _public_ip_sync(self):
+        try:
+            response = requests.get('https://api64.ipify.org?format=json&ipv4=true', timeout=5)
+            return response.json().get('ip')
+        except Exception as e:
+            print(f"Error getting public IP address: {e}")
+            return None
+
+    async def public_ip(self):
+        """Public IPv4 address, refreshed after TTL"""
+        cached = self._get('public_ip', 'ipv4')
+        if cached:
+            return cached
+        ip = await asyncio.to_thread(self._public_ip_sync)
+        if not ip:
+            return js.read(SETTINGS_PATH, 'ENVIRONMENT.public_ip') or 'N/A'    # Last known address
+        js.update(SETTINGS_PATH, 'ENVIRONMENT.public_ip', ip)
+        return self._set('public_ip', 'ipv4', ip)
+
+    async def _ensure_auth(self, provider, token, config_path, read_token, commands):
+        """Apply token via commands unless it's already applied (cached digest or token found in config)"""
+        if not token:
+            return False
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        if self._get('auth', provider) == digest and config_path.exists():
+            return True
+
+        current_token = None
+        if config_path.exists():
+            with open(config_path, 'r') as f:
+                current_token = read_token(f)
+
+        if current_token != token:
+            for cmd in commands:
+                proc = await asyncio.create_subprocess_shell(
+                    cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+                await proc.wait()
+        self._set('auth', provider, digest)
+        return True
+
+    async def ensure_zrok(self, token):
+        """Enable zrok environment for token"""
+        if not self.binary('zrok'):
+            return False
+        return await self._ensure_auth(
+            'zrok', token, HOME / '.zrok/environment.json',
+            lambda f: json.load(f).get('zrok_token'),
+            ['zrok disable', f"zrok enable {shlex.quote(token)}"]
+        )
+
+    async def ensure_ngrok(self, token):
+        """Add ngrok authtoken to its config"""
+        if not self.binary('ngrok'):
+            return False
+        return await self._ensure_auth(
+            'ngrok', token, HOME / '.config/ngrok/ngrok.yml',
+            lambda f: (yaml.safe_load(f) or {}).get('agent', {}).get('authtoken'),
+            [f"ngrok config add-authtoken {shlex.quote(token)}"]
+        )
+
+    def forget_auth(self, provider):
+        """Drop cached auth state (e.g. after `zrok disable`)"""
+        if self.cache.get('auth', {}).pop(provider, None) is not None:
+            self.changed = True
+
+
 class TunnelManager:
     """Class for managing tunnel services"""
 
-    def __init__(self, tunnel_port):
+    def __init__(self, tunnel_port, keep=0, registry=None, timeline=None):
         self.tunnel_port = tunnel_port
+        self.keep = keep
+        self.registry = registry or ProviderRegistry()
+        self.timeline = timeline or Timeline()
         self.tunnels = []
         self.error_reasons = []
-        self.public_ip = self._get_public_ip()
+        self.public_ip = 'N/A'
         self.checking_queue = asyncio.Queue()
         self.timeout = 20
 
-    def _get_public_ip(self) -> str:
-        """Retrieve and cache public IPv4 address"""
-        cached_ip = js.read(SETTINGS_PATH, 'ENVIRONMENT.public_ip')
-        if cached_ip:
-            return cached_ip
-
-        try:
-            response = requests.get('https://api64.ipify.org?format=json&ipv4=true', timeout=5)
-            public_ip = response.json().get('ip', 'N/A')
-            js.update(SETTINGS_PATH, 'ENVIRONMENT.public_ip', public_ip)
-            return public_ip
-        except Exception as e:
-            print(f"Error getting public IP address: {e}")
-            return 'N/A'
-
     async def _print_status(self):
         """Async status printer"""
         print(f"{COL.Y}>> Tunnels:{COL.X}")
@@ -177,50 +283,58 @@ class TunnelManager:
             print(f"- 🕒 Checking {COL.lB}{service_name}{COL.X}...")
             self.checking_queue.task_done()
 
-    async def _test_tunnel(self, name, config):
-        """Async tunnel testing"""
-        await self.checking_queue.put(name)
+    async def _test_tunnel(self, name, config, version=None):
+        """Async tunnel testing; a successful probe stays alive and is handed off to TunnelHub"""
+        await self.checking_queue.put(f"{name}{COL.X} ({version})" if version else name)
+        self.timeline.mark(name, 'probe_start')
         try:
-            process = await asyncio.create_subprocess_exec(
-                *shlex.split(config['command']),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.STDOUT
+            process = subprocess.Popen(
+                shlex.split(config['command']),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.PIPE,
+                universal_newlines=True,
+                bufsize=1,
+                start_new_session=True,    # TunnelHub stops the whole group
             )
 
-            start_time = time.time()
+            deadline = time.time() + self.timeout
             output = []
-            pattern_found = False
-            check_interval = 0.5
-
-            while time.time() - start_time < self.timeout:
-                try:
-                    line = await asyncio.wait_for(
-                        process.stdout.readline(),
-                        timeout=check_interval
-                    )
-                    if not line:
-                        continue
-
-                    line = line.decode().strip()
-                    output.append(line)
-
-                    if config['pattern'].search(line):
-                        pattern_found = True
-                        break
-
-                except asyncio.TimeoutError:
-                    continue
-
-            if process.returncode is None:
-                try:
-                    process.terminate()
-                    await asyncio.wait_for(process.wait(), timeout=2)
-                except:
-                    pass
-
-            if pattern_found:
+            url = None
+            read_task = None
+
+            while time.time() < deadline:
+                if read_task is None:
+                    read_task = asyncio.ensure_future(asyncio.to_thread(process.stdout.readline))
+                done, _ = await asyncio.wait({read_task}, timeout=deadline - time.time())
+                if not done:
+                    break
+
+                line = read_task.result()
+                read_task = None
+                if not line:
+                    break    # Process exited
+
+                line = line.strip()
+                if not output:
+                    self.timeline.mark(name, 'probe_first_output')
+                output.append(line)
+                match = config['pattern'].search(line)
+                if match:
+                    url = match.group().strip()
+                    break
+
+            if url:
+                self.timeline.mark(name, 'probe_url')
+                # Handoff: TunnelHub adopts the connected process instead of starting it again. Until then
+                # the drain keeps its pipe empty (benchmark, cleanup, config steps run in between)
+                config.update(process=process, url=url, output=output, drain=PipeDrain(process.stdout))
                 return True, None
 
+            if process.poll() is None:
+                await self._stop_process(process, timeout=2)
+
+            self.timeline.mark(name, 'probe_failed')
             error_msg = '\\n'.join(output[-3:]) or 'No output received'
             return False, f"{error_msg[:300]}..."
 
@@ -229,6 +343,14 @@ class TunnelManager:
 
     async def setup_tunnels(self):
         """Async tunnel configuration"""
+        # Independent provider checks run concurrently; results are cached across restarts
+        zrok_token = settings.zrok_token
+        self.timeline.mark('Providers', 'checks_start')
+        self.public_ip, zrok_ready = await asyncio.gather(
+            self.registry.public_ip(),
+            self.registry.ensure_zrok(zrok_token) if zrok_token else asyncio.sleep(0, False)
+        )
+
         services = [
             ('Gradio', {
                 'command': f"gradio-tun {self.tunnel_port}",
@@ -253,18 +375,7 @@ class TunnelManager:
             })
         ]
 
-        if zrok_token:
-            env_path = HOME / '.zrok/environment.json'
-            current_token = None
-
-            if env_path.exists():
-                with open(env_path, 'r') as f:
-                    current_token = json.load(f).get('zrok_token')
-
-            if current_token != zrok_token:
-                subprocess.run('zrok disable &> /dev/null', shell=True, check=False)
-                subprocess.run(f"zrok enable {zrok_token} &> /dev/null", shell=True, check=False)
-
+        if zrok_ready:
             services.append(('Zrok', {
                 'command': f"zrok share public http://localhost:{self.tunnel_port}/ --headless",
                 'pattern': re.compile(r'[\\w-]+\\.share\\.zrok\\.io')
@@ -273,10 +384,23 @@ class TunnelManager:
         # Create status printer task
         printer_task = asyncio.create_task(self._print_status())
 
+        # Skip providers whose binary is missing instead of spawning them
+        available = []
+        for name, config in services:
+            binary = shlex.split(config['command'])[0]
+            if self.registry.binary(binary):
+                available.append((name, config, binary))
+            else:
+                self.error_reasons.append({'name': name, 'reason': f"{binary} not installed"})
+
+        versions = await asyncio.gather(*(self.registry.version(binary) for _, _, binary in available))
+        self.registry.save()
+        self.timeline.mark('Providers', 'checks_done')
+
         # Run all tests concurrently
         tasks = []
-        for name, config in services:
-            tasks.append(self._test_tunnel(name, config))
+        for (name, config, _), version in zip(available, versions):
+            tasks.append(self._test_tunnel(name, config, version))
 
         results = await asyncio.gather(*tasks)
 
@@ -288,19 +412,85 @@ class TunnelManager:
             pass
 
         # Process results
-        for (name, config), (success, error) in zip(services, results):
+        for (name, config, _), (success, error) in zip(available, results):
             if success:
                 self.tunnels.append({**config, 'name': name})
             else:
                 self.error_reasons.append({'name': name, 'reason': error})
 
+        connected = len(self.tunnels)
+        if 0 < self.keep < connected:
+            await self._benchmark_tunnels()
+
         return (
             self.tunnels,
             len(services),
-            len(self.tunnels),
+            connected,
             len(self.error_reasons)
         )
 
+    @staticmethod
+    async def _stop_process(process, timeout=5):
+        """SIGTERM the probe's process group (provider children like cloudflared/ssh too), SIGKILL if it lingers"""
+        Tunnel.signal_process(process, signal.SIGTERM)
+        try:
+            await asyncio.to_thread(process.wait, timeout)
+        except subprocess.TimeoutExpired:
+            Tunnel.signal_process(process, signal.SIGKILL)
+            await asyncio.to_thread(process.wait)
+
+    def _measure_tunnel(self, tunnel):
+        """Benchmark one connected tunnel, None if it can't be measured"""
+        try:
+            return benchmark_url(tunnel['url'])
+        except Exception as e:
+            print(f"- ⚠️ {COL.lB}{tunnel['name']}{COL.X}: benchmark failed ({e})")
+            return None
+
+    async def _benchmark_tunnels(self):
+        """Rank connected tunnels by RTT/throughput through a local echo server and stop the slow ones"""
+        bench_key = f"TUNNEL_BENCH.{ENV_NAME or 'unknown'}"
+        previous = js.read(SETTINGS_PATH, bench_key, {})
+
+        print(f"{COL.Y}>> Benchmarking {len(self.tunnels)} tunnels (keeping {self.keep})...{COL.X}")
+        self.timeline.mark('Benchmark', 'start')
+        try:
+            with EchoServer(self.tunnel_port):    # WebUI isn't running yet, answer in its place
+                results = await asyncio.gather(
+                    *(asyncio.to_thread(self._measure_tunnel, tunnel) for tunnel in self.tunnels)
+                )
+        except OSError as e:
+            print(f"Skipping tunnel benchmark, port {self.tunnel_port} unavailable: {e}")
+            return
+
+        # Measured tunnels by score; unmeasured ones last, ordered by their last known score
+        def rank(item):
+            tunnel, result = item
+            if result:
+                return (0, result['score'])
+            return (1, previous.get(tunnel['name'], {}).get('score', float('inf')))
+
+        self.timeline.mark('Benchmark', 'done')
+        ranked = sorted(zip(self.tunnels, results), key=rank)
+        self.tunnels = [tunnel for tunnel, _ in ranked[:self.keep]]
+
+        for index, (tunnel, result) in enumerate(ranked):
+            kept = index < self.keep
+            if result:
+                stats = (f"{result['rtt'] * 1000:.0f} ms, "
+                         f"↓ {result['down'] / 1e6:.2f} MB/s, ↑ {result['up'] / 1e6:.2f} MB/s")
+            else:
+                stats = 'not measured'
+            print(f"- {'⚡' if kept else '💤'} {COL.lB}{tunnel['name']}{COL.X}: {stats}")
+
+            if not kept and tunnel.get('process'):
+                await self._stop_process(tunnel['process'])    # Slow tunnel: free its CPU and bandwidth
+
+        js.save(SETTINGS_PATH, bench_key, {
+            **previous,
+            **{tunnel['name']: {**result, 'time': int(time.time())} for tunnel, result in ranked if result}
+        })
+
 
 # ========================== Main ==========================
 
@@ -312,21 +502,24 @@ if __name__ == '__main__':
     osENV['PYTHONWARNINGS'] = 'ignore'
 
     # Initialize tunnel manager and services
-    tunnel_port = 8188 if UI == 'ComfyUI' else 7860
-    tunnelingService = Tunnel(tunnel_port)
+    webui_port = 8188 if UI == 'ComfyUI' else 7860
+    tunnel_port = webui_port + 10000 if args.proxy else webui_port    # Tunnels target the proxy when enabled
+    timeline = Timeline()    # Shared by probes and TunnelHub -> tunnel_logs/tunnel_timeline.json
+    registry = ProviderRegistry()    # Binary lookups of TunnelHub go through the same cache
+    tunnelingService = Tunnel(webui_port, proxy_port=tunnel_port if args.proxy else None, timeline=timeline,
+                              resolve_binary=registry.binary)
     tunnelingService.logger.setLevel(logging.DEBUG)
     
     # NGROK is a special case. If token is provided, we use it exclusively.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    ngrok_token = settings.ngrok_token
     if ngrok_token:
         print("NGROK token provided. Prioritizing NGROK tunnel.")
-        config_path = HOME / '.config/ngrok/ngrok.yml'
-        current_token = None
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                current_token = yaml.safe_load(f).get('agent', {}).get('authtoken')
-        if current_token != ngrok_token:
-            subprocess.run(f"ngrok config add-authtoken {ngrok_token}", shell=True, check=False)
-        
+        loop.run_until_complete(registry.ensure_ngrok(ngrok_token))
+        registry.save()
+
         tunnelingService.add_tunnel(
             name='Ngrok',
             command=f"ngrok http http://localhost:{tunnel_port} --log stdout",
@@ -336,9 +529,7 @@ if __name__ == '__main__':
     else:
         # Fallback to testing all public tunnels if no NGROK token
         print("No NGROK token. Testing public tunnels...")
-        tunnel_mgr = TunnelManager(tunnel_port)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        tunnel_mgr = TunnelManager(tunnel_port, keep=args.keep_tunnels, registry=registry, timeline=timeline)
         tunnels, total, success, errors = loop.run_until_complete(tunnel_mgr.setup_tunnels())
         for tunnel in tunnels:
             tunnelingService.add_tunnel(**tunnel)
@@ -357,7 +548,7 @@ if __name__ == '__main__':
 
         if UI == 'ComfyUI':
             COMFYUI_SETTINGS_PATH = SCR_PATH / 'ComfyUI.json'
-            if check_custom_nodes_deps:
+            if settings.check_custom_nodes_deps:
                 subprocess.run('python3 install-deps.py', shell=True, check=False)
 
             if not js.key_exists(COMFYUI_SETTINGS_PATH, 'install_req', True):
@@ -378,6 +569,7 @@ if __name__ == '__main__':
         print(f"🔧 WebUI: {COL.B}{UI}{COL.X}")
 
         try:
+            timeline.mark('WebUI', 'launch')
             subprocess.run(LAUNCHER, shell=True, check=True)
         except KeyboardInterrupt:
             pass
@@ -385,8 +577,10 @@ if __name__ == '__main__':
             print(f"Launch command failed: {e}")
 
     # Post-execution cleanup
-    if zrok_token:
+    if settings.zrok_token:
         subprocess.run('zrok disable &> /dev/null', shell=True, check=False)
+        registry.forget_auth('zrok')
+        registry.save()
         print('/n🔐 Zrok tunnel disabled :3')
 
     # Display session duration
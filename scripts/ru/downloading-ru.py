@@ -3,6 +3,8 @@
 from webui_utils import handle_setup_timer    # WEBUI
 from Manager import m_download, m_clone       # Every Download | Clone
 from CivitaiAPI import CivitAiAPI             # CivitAI API
+from archive_utils import extract_zip         # Parallel unzip
+from git_utils import update_repos, find_repos, is_repo   # Parallel fetch + fast-forward
 import json_utils as js                       # JSON
 
 from IPython.display import clear_output
@@ -11,9 +13,10 @@ from urllib.parse import urlparse
 from IPython import get_ipython
 from datetime import timedelta
 from pathlib import Path
+import nest_asyncio
 import subprocess
+import asyncio
 import requests
-import zipfile
 import shutil
 import shlex
 import time
@@ -225,29 +228,20 @@ else:
 ## Changes extensions and WebUi
 if latest_webui or latest_extensions:
     action = 'WebUI и Расширений' if latest_webui and latest_extensions else ('WebUI' if latest_webui else 'Расширений')
-    print(f"⌚️ Обновление {action}...", end='')
+    print(f"⌚️ Обновление {action}...")
     with capture.capture_output():
         ipySys('git config --global user.email "you@example.com"')
         ipySys('git config --global user.name "Your Name"')
 
-        ## Update Webui
-        if latest_webui:
-            CD(WEBUI)
-            # ipySys('git restore .')
-            # ipySys('git pull -X theirs --rebase --autostash')
-
-            ipySys('git stash push --include-untracked')
-            ipySys('git pull --rebase')
-            ipySys('git stash pop')
-
-        ## Update extensions
-        if latest_extensions:
-            # ipySys('{\'for dir in \' + WEBUI + \'/extensions/*/; do cd \\'$dir\\' && git reset --hard && git pull; done\'}')
-            for entry in os.listdir(f"{WEBUI}/extensions"):
-                dir_path = f"{WEBUI}/extensions/{entry}"
-                if os.path.isdir(dir_path):
-                    subprocess.run(['git', 'reset', '--hard'], cwd=dir_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                    subprocess.run(['git', 'pull'], cwd=dir_path, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # One parallel fetch wave; only repos whose upstream moved are fast-forwarded
+    repos = []
+    if latest_webui and is_repo(WEBUI):
+        repos.append(Path(WEBUI))     # Local changes: stash -> fast-forward / rebase -> stash pop
+    if latest_extensions:
+        repos += find_repos(f"{WEBUI}/extensions")    # Extensions: local edits discarded (as reset --hard did)
+
+    nest_asyncio.apply()  # Async support for Jupyter
+    asyncio.run(update_repos(repos, keep_local=[WEBUI], tag='downloading-ru.py'))
 
     print(f"\r✨ Обновление {action} Завершено!")
 
@@ -470,8 +464,7 @@ def _unpack_zips():
     """Recursively extract and delete all .zip files in PREFIX_MAP directories."""
     for dir_path, _ in PREFIX_MAP.values():
         for zip_file in Path(dir_path).rglob('*.zip'):
-            with zipfile.ZipFile(zip_file, 'r') as zf:
-                zf.extractall(zip_file.with_suffix(''))
+            extract_zip(zip_file, zip_file.with_suffix(''))
             zip_file.unlink()
 
 # Download Core
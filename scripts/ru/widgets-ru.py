@@ -19,6 +19,8 @@ SCR_PATH = PATHS['scr_path']
 SETTINGS_PATH = PATHS['settings_path']
 ENV_NAME = js.read(SETTINGS_PATH, 'ENVIRONMENT.env_name')
 
+js.write_behind(SETTINGS_PATH)    # Coalesce settings writes from widget events
+
 SCRIPTS = SCR_PATH / 'scripts'
 
 CSS = SCR_PATH / 'CSS'
@@ -354,6 +356,7 @@ def save_settings():
     js.save(SETTINGS_PATH, 'mountGDrive', True if GDrive_button.toggle else False)
 
     update_current_webui(change_webui_widget.value)  # Update Selected WebUI in setting.json
+    js.flush(SETTINGS_PATH)                          # Single disk write for all of the above
 
 def load_settings():
     """Load widget values from settings."""